@@ -12,25 +12,34 @@ Run:
 
 import os
 import re
-import json
-import base64
+import orjson
+import pybase64
+import hashlib
+import time
 import asyncio
+import traceback
 import jwt
+from jwt.algorithms import RSAAlgorithm
+from jwt.exceptions import InvalidKeyError
 from io import BytesIO
-from typing import Optional
+from collections import OrderedDict
+from types import MappingProxyType
+from contextlib import asynccontextmanager, nullcontext
+from functools import lru_cache
+from typing import Any, Optional, AsyncIterator, AsyncContextManager, Literal, get_args
 from datetime import datetime
 
 import httpx
 from PIL import Image
 from fastapi import FastAPI, HTTPException, BackgroundTasks, Depends, Header
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse, StreamingResponse
 from pydantic import BaseModel, HttpUrl
 from dotenv import load_dotenv
 from clerk_backend_api import Clerk
 
 # Import our Rightmove scraper
-from rightmove_scraper import scrape_rightmove_listing, PropertyListing
+from rightmove_scraper import scrape_rightmove_listing, normalize_listing_url, PropertyListing
 
 # Load environment variables
 load_dotenv()
@@ -46,6 +55,20 @@ REPLICATE_API_TOKEN = os.getenv("REPLICATE_API_TOKEN")
 CLERK_SECRET_KEY = os.getenv("CLERK_SECRET_KEY")
 clerk_client = Clerk(bearer_auth=CLERK_SECRET_KEY) if CLERK_SECRET_KEY else None
 
+# Token issuers we accept (comma-separated). The JWKS URL is built from the token's own
+# issuer, so without this a self-signed token could point us at an attacker's keys.
+# Defaults to the Clerk instance behind the publishable key in index.html.
+CLERK_ALLOWED_ISSUERS = frozenset(
+    issuer.strip().rstrip('/')
+    for issuer in os.getenv("CLERK_ALLOWED_ISSUERS", "https://bursting-pug-52.clerk.accounts.dev").split(",")
+    if issuer.strip()
+)
+
+# JWKS endpoint for each allowed issuer, built once here rather than per key refresh
+CLERK_JWKS_URLS = MappingProxyType({
+    issuer: f"{issuer}/.well-known/jwks.json" for issuer in CLERK_ALLOWED_ISSUERS
+})
+
 # Image generation provider: "gemini" or "replicate"
 # Gemini image gen is geo-blocked in some countries (UK, EU)
 # Replicate works worldwide
@@ -62,10 +85,114 @@ COMET_API_URL = "https://api.cometapi.com/v1beta/models/gemini-3-pro-image-previ
 # Use CometAPI if available, otherwise use Google's direct API
 USE_COMET_API = bool(COMET_API_KEY)
 
+# Batch scraping limits - keep concurrency low to avoid Rightmove rate limiting
+MAX_BATCH_URLS = 10
+
+# Max scrapes (headless Chromium sessions) running at once across ALL requests -
+# single, batch and stream endpoints share this limit
+SCRAPE_MAX_CONCURRENCY = 5
+
+# Largest source image we'll download for renovation (bytes)
+MAX_SOURCE_IMAGE_BYTES = 20 * 1024 * 1024
+
+# Per-request timeouts (seconds) for the image generation providers
+REPLICATE_TIMEOUT = 300.0
+GEMINI_TIMEOUT = 180.0
+
+# Replicate status polling: first delay, backoff cap, and overall limit (seconds)
+REPLICATE_POLL_INITIAL_DELAY = 0.5
+REPLICATE_POLL_MAX_DELAY = 5.0
+REPLICATE_POLL_TIMEOUT = 300.0
+
+# How long Clerk's signing keys are trusted before re-fetching the JWKS (seconds)
+JWKS_CACHE_TTL = 3600.0
+
+# Minimum gap between JWKS fetches for one issuer - tokens with made-up key IDs are
+# answered "key not found" from cache instead of each forcing a fetch (seconds)
+JWKS_MIN_REFRESH_INTERVAL = 30.0
+
+# Keep JWKS fetches short - a stalled Clerk endpoint shouldn't hold every authenticated request
+JWKS_FETCH_TIMEOUT = httpx.Timeout(3.0, connect=1.0)
+
+# Max number of verified session tokens remembered (each is reused until its own expiry)
+VERIFIED_TOKEN_CACHE_SIZE = 10000
+
+# How long a rejected session token is answered from memory, and how many are remembered
+REJECTED_TOKEN_TTL = 60.0
+REJECTED_TOKEN_CACHE_SIZE = 1024
+
+# How long a scraped listing is served from memory, and how many listings are kept
+LISTING_CACHE_TTL = 600.0
+LISTING_CACHE_SIZE = 256
+
+# How long the /models listing is reused before asking Google again (seconds)
+MODELS_CACHE_TTL = 600.0
+
+# JPEG quality for re-encoded source images - the model input doesn't benefit from more
+SOURCE_JPEG_QUALITY = 85
+
+# Headers to look like a real browser - needed for Rightmove images
+IMAGE_REQUEST_HEADERS = MappingProxyType({
+    "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+    "Accept": "image/avif,image/webp,image/apng,image/svg+xml,image/*,*/*;q=0.8",
+    "Accept-Language": "en-GB,en;q=0.9",
+    "Referer": "https://www.rightmove.co.uk/",
+})
+
+# Memory budget for processed source images kept for reuse (bytes of base64)
+SOURCE_IMAGE_CACHE_BYTES = 64 * 1024 * 1024
+
+# Max number of prompt configurations kept in memory (least recently used evicted first)
+PROMPT_CACHE_SIZE = 2048
+
+# Shared HTTP client - created on startup so connections stay pooled between requests
+http_client: Optional[httpx.AsyncClient] = None
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Create the shared HTTP client, prewarm a connection to Rightmove and load Clerk's signing keys."""
+    global http_client
+    http_client = httpx.AsyncClient(timeout=30.0, follow_redirects=True)
+
+    # Establish TCP+TLS up front so the first scrape after boot skips the handshake
+    try:
+        await http_client.head("https://www.rightmove.co.uk/", timeout=5.0)
+        print("[INFO] Rightmove connection prewarmed")
+    except httpx.HTTPError as e:
+        print(f"[WARNING] Rightmove prewarm failed: {type(e).__name__}")
+
+    # Load Clerk's signing keys up front so the first authenticated request skips the JWKS fetch
+    if CLERK_SECRET_KEY:
+        for issuer in CLERK_ALLOWED_ISSUERS:
+            try:
+                await refresh_clerk_signing_keys(issuer)
+                print(f"[INFO] Clerk signing keys loaded for {issuer}")
+            except Exception as e:
+                # Best effort - requests fetch the keys themselves on a miss
+                print(f"[WARNING] Clerk signing key prefetch failed for {issuer}: {type(e).__name__}")
+
+    yield
+
+    await http_client.aclose()
+
+
+def pooled_http_client() -> AsyncContextManager[httpx.AsyncClient]:
+    """
+    The shared client as an async context manager, so call sites keep their `async with` shape.
+    Falls back to a short-lived client when called outside the app (e.g. scripts).
+    Per-request timeouts are passed on each call since the shared client's default is 30s.
+    """
+    if http_client is not None:
+        return nullcontext(http_client)
+    return httpx.AsyncClient(timeout=30.0, follow_redirects=True)
+
 app = FastAPI(
     title="Renovision API",
     description="Transform doer-upper properties with AI-powered renovation visualisation",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan,
+    # orjson serialises large image lists much faster than stdlib json
+    default_response_class=ORJSONResponse
 )
 
 # CORS for frontend
@@ -103,10 +230,35 @@ class PropertyResponse(BaseModel):
     floorplan_urls: list[str] = []
     agent_name: str = ""
 
+class BatchPropertyRequest(BaseModel):
+    urls: list[HttpUrl]
+
+class BatchPropertyResult(BaseModel):
+    url: str
+    property: Optional[PropertyResponse] = None
+    error: Optional[str] = None
+
+class BatchPropertyResponse(BaseModel):
+    results: list[BatchPropertyResult]
+
+# Interior design styles - keep in sync with STYLE_PROMPTS
+StyleName = Literal[
+    'english_contemporary',
+    'modern_organic',
+    'scandinavian_minimalism',
+    'japandi',
+    'parisian_classic',
+    'coastal_elevated',
+    'midcentury_modern',
+    'moody_contemporary',
+    'rustic_modern',
+    'hals_choice',
+]
+
 class RenovationRequest(BaseModel):
     image_url: str
     # Primary configuration options
-    style: Optional[str] = None  # midcentury, minimal, industrial, scandinavian, wabisabi, mediterranean
+    style: Optional[StyleName] = None  # validated by pydantic, unknown styles get a 422
     room_type: Optional[str] = None  # living, bedroom, kitchen, dining, bathroom, office, hallway, garden, outdoor
     # Optional configuration toggles
     time_of_day: Optional[str] = None  # day, night, golden_hour
@@ -128,6 +280,138 @@ class RenovationResponse(BaseModel):
 # AUTHENTICATION
 # ============================================
 
+# Clerk public keys keyed by (issuer, kid) -> (key, fetched_at). Keys rotate rarely,
+# so fetching the JWKS on every authenticated request was pure latency
+_jwks_cache: dict[tuple[str, str], tuple[Any, float]] = {}
+_jwks_lock = asyncio.Lock()
+
+# When each issuer's key set was last fetched successfully
+_jwks_fetched_at: dict[str, float] = {}
+
+
+def _jwks_recently_fetched(issuer: str) -> bool:
+    """True if the issuer's key set is fresh enough that a missing kid means it isn't published."""
+    fetched_at = _jwks_fetched_at.get(issuer)
+    return fetched_at is not None and time.monotonic() - fetched_at < JWKS_MIN_REFRESH_INTERVAL
+
+async def get_clerk_signing_key(issuer: str, kid: str) -> Optional[Any]:
+    """
+    Return the public key for a token's issuer and key ID, or None if the issuer doesn't publish it.
+    Misses refresh the whole key set under a lock so concurrent requests share one fetch,
+    at most once per JWKS_MIN_REFRESH_INTERVAL per issuer.
+    """
+    cached = _jwks_cache.get((issuer, kid))
+    if cached is not None and time.monotonic() - cached[1] < JWKS_CACHE_TTL:
+        return cached[0]
+
+    # Unknown kid against a just-fetched set - don't queue behind the lock for another fetch
+    if _jwks_recently_fetched(issuer):
+        return None
+
+    async with _jwks_lock:
+        # Another request may have refreshed the keys while we waited
+        cached = _jwks_cache.get((issuer, kid))
+        if cached is not None and time.monotonic() - cached[1] < JWKS_CACHE_TTL:
+            return cached[0]
+        if _jwks_recently_fetched(issuer):
+            return None
+
+        try:
+            await refresh_clerk_signing_keys(issuer)
+        except httpx.HTTPError as e:
+            # Clerk being slow or unreachable isn't the user's fault - let the client retry
+            print(f"[AUTH] JWKS fetch failed: {type(e).__name__}: {e}")
+            raise HTTPException(status_code=503, detail="Authentication service unavailable. Please try again.")
+
+        # Same freshness rule as above - a refresh replaces the issuer's whole set,
+        # so a kid Clerk no longer publishes is simply gone
+        cached = _jwks_cache.get((issuer, kid))
+        if cached is not None and time.monotonic() - cached[1] < JWKS_CACHE_TTL:
+            return cached[0]
+        return None
+
+
+async def refresh_clerk_signing_keys(issuer: str) -> None:
+    """
+    Fetch an allowed issuer's JWKS and make it the issuer's whole cached key set.
+    Keys missing from the response (rotated out or revoked) are dropped.
+    """
+    jwks_url = CLERK_JWKS_URLS[issuer]
+
+    # Fetch Clerk's JWKS (JSON Web Key Set) to get the public key
+    async with pooled_http_client() as client:
+        response = await client.get(jwks_url, timeout=JWKS_FETCH_TIMEOUT, follow_redirects=False)
+
+        if response.status_code != 200:
+            print(f"[AUTH] Failed to fetch JWKS: {response.status_code}")
+            raise HTTPException(status_code=503, detail="Authentication service unavailable. Please try again.")
+
+    try:
+        jwks = orjson.loads(response.content)
+        keys = jwks.get('keys', [])
+        if not isinstance(keys, list):
+            raise TypeError("'keys' is not a list")
+    except (ValueError, TypeError, AttributeError) as e:
+        # A malformed key set is Clerk's problem, not the token's - same as an outage
+        print(f"[AUTH] Malformed JWKS from {jwks_url}: {type(e).__name__}: {e}")
+        raise HTTPException(status_code=503, detail="Authentication service unavailable. Please try again.")
+
+    # Convert every RSA key in the set once to a key object PyJWT can use directly
+    # (from_jwk takes the parsed dict - no need to re-serialise it). One bad or
+    # unsupported entry is skipped so it can't take the valid keys down with it.
+    signing_keys = []
+    for key in keys:
+        if not isinstance(key, dict) or key.get('kty') != 'RSA' or not key.get('kid'):
+            continue
+        try:
+            signing_keys.append((key['kid'], RSAAlgorithm.from_jwk(key)))
+        except (ValueError, KeyError, TypeError, InvalidKeyError) as e:
+            print(f"[AUTH] Skipping unusable JWKS key {key.get('kid')!r}: {type(e).__name__}: {e}")
+
+    fetched_at = time.monotonic()
+    published = {kid for kid, _ in signing_keys}
+    for stale in [key for key in _jwks_cache if key[0] == issuer and key[1] not in published]:
+        del _jwks_cache[stale]
+    for kid, signing_key in signing_keys:
+        _jwks_cache[(issuer, kid)] = (signing_key, fetched_at)
+    _jwks_fetched_at[issuer] = fetched_at
+
+
+def peek_jwt(token: str) -> tuple[dict, dict]:
+    """
+    Decode a JWT's header and payload without verifying it, in one pass.
+    Only used to find the signing key - jwt.decode still verifies everything afterwards.
+    """
+    try:
+        header_b64, payload_b64, _ = token.split(".", 2)
+        header = orjson.loads(pybase64.urlsafe_b64decode(header_b64 + "=" * (-len(header_b64) % 4)))
+        payload = orjson.loads(pybase64.urlsafe_b64decode(payload_b64 + "=" * (-len(payload_b64) % 4)))
+    except Exception as e:
+        raise jwt.DecodeError(f"Invalid token segments: {e}") from e
+
+    if not isinstance(header, dict) or not isinstance(payload, dict):
+        raise jwt.DecodeError("Invalid token segments: expected JSON objects")
+    return header, payload
+
+
+# Verified session tokens keyed by SHA-256 digest -> (user, exp), least recently used first.
+# The frontend reuses a session token across requests, so only its first use pays for RS256
+_verified_tokens: OrderedDict[bytes, tuple[dict, float]] = OrderedDict()
+
+# Recently rejected session tokens keyed by SHA-256 digest -> (401 detail, retry_after).
+# Clients replaying a bad token get the same 401 without another decode or JWKS lookup
+_rejected_tokens: OrderedDict[bytes, tuple[str, float]] = OrderedDict()
+
+
+class TokenRejected(HTTPException):
+    """
+    A 401 for a token that can never become valid (bad signature, malformed, untrusted
+    issuer, unknown key, expired), so it's safe to remember in _rejected_tokens.
+    Timing-dependent or unexpected failures raise a plain HTTPException instead.
+    """
+    def __init__(self, detail: str):
+        super().__init__(status_code=401, detail=detail)
+
 async def verify_clerk_session(authorization: Optional[str] = Header(None)) -> dict:
     """
     FastAPI dependency to verify Clerk session tokens.
@@ -146,57 +430,85 @@ async def verify_clerk_session(authorization: Optional[str] = Header(None)) -> d
             detail="Missing authentication. Please sign in to use this service."
         )
 
-    # Extract Bearer token
-    parts = authorization.split()
-    if len(parts) != 2 or parts[0].lower() != "bearer":
+    # Extract Bearer token (scheme is case-insensitive)
+    session_token = authorization[7:].strip()
+    if authorization[:7].lower() != "bearer " or not session_token or " " in session_token:
         raise HTTPException(
             status_code=401,
             detail="Invalid authorization header format. Expected: Bearer <token>"
         )
 
-    session_token = parts[1]
+    # Repeat presentations of an already-verified token skip the RS256 verify until it expires
+    token_digest = hashlib.sha256(session_token.encode()).digest()
+    cached = _verified_tokens.get(token_digest)
+    if cached is not None:
+        user, expires_at = cached
+        if expires_at > time.time():
+            _verified_tokens.move_to_end(token_digest)
+            return dict(user)
+        del _verified_tokens[token_digest]
+
+    # Tokens rejected recently are rejected again without decoding or verifying them
+    rejected = _rejected_tokens.get(token_digest)
+    if rejected is not None:
+        detail, retry_after = rejected
+        if retry_after > time.time():
+            raise HTTPException(status_code=401, detail=detail)
+        del _rejected_tokens[token_digest]
 
     try:
-        print(f"[AUTH] Attempting to verify session token...")
+        user, expires_at = await _verify_session_token(session_token)
+    except TokenRejected as e:
+        # Only remember rejections that can't change on retry - not Clerk outages,
+        # not-yet-valid tokens, or unexpected failures
+        _rejected_tokens[token_digest] = (e.detail, time.time() + REJECTED_TOKEN_TTL)
+        if len(_rejected_tokens) > REJECTED_TOKEN_CACHE_SIZE:
+            _rejected_tokens.popitem(last=False)
+        raise
+
+    if isinstance(expires_at, (int, float)):
+        _verified_tokens[token_digest] = (user, expires_at)
+        if len(_verified_tokens) > VERIFIED_TOKEN_CACHE_SIZE:
+            _verified_tokens.popitem(last=False)
+
+    return dict(user)
+
 
+async def _verify_session_token(session_token: str) -> tuple[dict, Any]:
+    """
+    Verify a session token against Clerk's signing keys.
+    Returns the user and the token's exp claim (so the caller can cache until then).
+    """
+    try:
         # Decode JWT without verification first to get the header and payload
-        unverified_header = jwt.get_unverified_header(session_token)
-        unverified_payload = jwt.decode(session_token, options={"verify_signature": False})
+        unverified_header, unverified_payload = peek_jwt(session_token)
+
+        # An expired token can't pass jwt.decode whatever its signature, so skip the
+        # key lookup and RSA verify (same comparison PyJWT makes, with no leeway)
+        exp = unverified_payload.get('exp')
+        if isinstance(exp, (int, float)) and exp <= time.time():
+            raise jwt.ExpiredSignatureError("Signature has expired")
 
         # Get the key ID from the JWT header
         kid = unverified_header.get('kid')
         if not kid:
-            raise HTTPException(status_code=401, detail="Invalid token: missing key ID")
+            raise TokenRejected("Invalid token: missing key ID")
 
         # Get the issuer from the JWT payload to construct the JWKS URL
         issuer = unverified_payload.get('iss')
         if not issuer:
-            raise HTTPException(status_code=401, detail="Invalid token: missing issuer")
-
-        # Construct JWKS URL from issuer (e.g., https://clerk.example.com/.well-known/jwks.json)
-        jwks_url = f"{issuer.rstrip('/')}/.well-known/jwks.json"
-
-        # Fetch Clerk's JWKS (JSON Web Key Set) to get the public key
-        async with httpx.AsyncClient() as client:
-            response = await client.get(jwks_url)
+            raise TokenRejected("Invalid token: missing issuer")
 
-            if response.status_code != 200:
-                print(f"[AUTH] Failed to fetch JWKS: {response.status_code}")
-                raise HTTPException(status_code=401, detail="Failed to verify token")
-
-            jwks = response.json()
+        # Reject unknown issuers before any network I/O
+        if not isinstance(issuer, str) or issuer.rstrip('/') not in CLERK_ALLOWED_ISSUERS:
+            print(f"[AUTH] ❌ Untrusted issuer: {issuer!r}")
+            raise TokenRejected("Invalid token: untrusted issuer")
+        issuer = issuer.rstrip('/')
 
-            # Find the matching key
-            signing_key = None
-            for key in jwks.get('keys', []):
-                if key.get('kid') == kid:
-                    # Convert JWK to PEM format for PyJWT
-                    from jwt.algorithms import RSAAlgorithm
-                    signing_key = RSAAlgorithm.from_jwk(json.dumps(key))
-                    break
-
-            if not signing_key:
-                raise HTTPException(status_code=401, detail="Invalid token: key not found")
+        # Look up Clerk's public key for this token (cached, fetched from the issuer's JWKS on a miss)
+        signing_key = await get_clerk_signing_key(issuer, kid)
+        if not signing_key:
+            raise TokenRejected("Invalid token: key not found")
 
         # Verify and decode the JWT
         verified_claims = jwt.decode(
@@ -206,33 +518,32 @@ async def verify_clerk_session(authorization: Optional[str] = Header(None)) -> d
             options={"verify_signature": True, "verify_exp": True}
         )
 
-        print(f"[AUTH] ✅ Session verified successfully. User ID: {verified_claims.get('sub')}")
-
         # Extract user information from JWT claims
-        return {
+        user = {
             "user_id": verified_claims.get("sub"),
             "session_id": verified_claims.get("sid"),
             "status": "active"
         }
+        return user, verified_claims.get("exp")
 
     except jwt.ExpiredSignatureError:
         print(f"[AUTH] ❌ Token expired")
-        raise HTTPException(
-            status_code=401,
-            detail="Session expired. Please sign in again."
-        )
-    except jwt.InvalidTokenError as e:
-        print(f"[AUTH] ❌ Invalid token: {str(e)}")
+        raise TokenRejected("Session expired. Please sign in again.")
+    except jwt.ImmatureSignatureError as e:
+        # nbf/iat slightly in the future (clock skew) - the same token may pass moments later
+        print(f"[AUTH] ❌ Token not yet valid: {e}")
         raise HTTPException(
             status_code=401,
             detail="Invalid session token. Please sign in again."
         )
+    except jwt.InvalidTokenError as e:
+        print(f"[AUTH] ❌ Invalid token: {e}")
+        raise TokenRejected("Invalid session token. Please sign in again.")
     except HTTPException:
         raise
     except Exception as e:
         # Token invalid, expired, or revoked
-        print(f"[AUTH] ❌ Token verification failed: {type(e).__name__}: {str(e)}")
-        import traceback
+        print(f"[AUTH] ❌ Token verification failed: {type(e).__name__}: {e}")
         traceback.print_exc()
         raise HTTPException(
             status_code=401,
@@ -243,12 +554,72 @@ async def verify_clerk_session(authorization: Optional[str] = Header(None)) -> d
 # RIGHTMOVE SCRAPING (uses rightmove_scraper module)
 # ============================================
 
+# In-flight scrapes keyed by normalised listing URL - concurrent requests
+# for the same listing share one scrape instead of each launching a browser
+_inflight_scrapes: dict[str, asyncio.Task] = {}
+
+# Recently scraped listings keyed by canonical Rightmove listing URL -> (response, scraped_at).
+# Listings change over hours, so repeat views within the TTL skip the scrape entirely.
+# Only URLs that pass normalize_listing_url ever reach this cache.
+_listing_cache: OrderedDict[str, tuple[PropertyResponse, float]] = OrderedDict()
+
+# Process-wide scrape limiter - a per-request semaphore only bounds one request's fan-out,
+# so concurrent batches would still launch a browser per URL
+_scrape_slots = asyncio.Semaphore(SCRAPE_MAX_CONCURRENCY)
+
 async def get_property_from_rightmove(url: str) -> PropertyResponse:
+    """
+    Fetch and parse a Rightmove listing, reusing a recent result or joining
+    any in-flight scrape of the same listing.
+    """
+    key = normalize_listing_url(url)
+    if key is None:
+        # Reject before touching shared state - a bad URL must never join or
+        # start a scrape that a real Rightmove request could end up sharing
+        print(f"[ERROR] Rejected listing URL: {url}")
+        raise HTTPException(status_code=400, detail="Invalid Rightmove property URL")
+
+    cached = _listing_cache.get(key)
+    if cached is not None:
+        if time.monotonic() - cached[1] < LISTING_CACHE_TTL:
+            _listing_cache.move_to_end(key)
+            return cached[0]
+        del _listing_cache[key]
+
+    task = _inflight_scrapes.get(key)
+
+    if task is None:
+        # Scrape the canonical URL so the shared result doesn't carry the
+        # first caller's tracking params
+        task = asyncio.create_task(_scrape_and_cache_property(key))
+        _inflight_scrapes[key] = task
+        task.add_done_callback(lambda _: _inflight_scrapes.pop(key, None))
+    else:
+        print(f"[INFO] Joining in-flight scrape for {key}")
+
+    # Shield so one caller disconnecting doesn't cancel the scrape for the others
+    return await asyncio.shield(task)
+
+
+async def _scrape_and_cache_property(listing_url: str) -> PropertyResponse:
+    """
+    Scrape a canonical listing URL and remember the result for LISTING_CACHE_TTL seconds.
+    The cached response's url is the canonical one, never a requester's raw URL.
+    """
+    async with _scrape_slots:
+        result = await _scrape_property(listing_url)
+    _listing_cache[listing_url] = (result, time.monotonic())
+    if len(_listing_cache) > LISTING_CACHE_SIZE:
+        _listing_cache.popitem(last=False)
+    return result
+
+
+async def _scrape_property(url: str) -> PropertyResponse:
     """
     Fetch and parse a Rightmove listing using our scraper module.
     """
     try:
-        listing = await scrape_rightmove_listing(url)
+        listing = await scrape_rightmove_listing(url, client=http_client)
         
         # Convert to API response format
         images = [
@@ -276,316 +647,494 @@ async def get_property_from_rightmove(url: str) -> PropertyResponse:
         )
         
     except ValueError as e:
-        raise HTTPException(status_code=400, detail=str(e))
+        # The scraper's message echoes the submitted URL - keep it in the server log
+        print(f"[ERROR] Rejected listing URL: {e}")
+        raise HTTPException(status_code=400, detail="Invalid Rightmove property URL")
     except Exception as e:
-        # Log the full error for debugging
-        import traceback
-        print(f"[ERROR] Scraper failed: {type(e).__name__}: {str(e)}")
-        print(traceback.format_exc())
-        raise HTTPException(status_code=500, detail=f"Failed to scrape property: {str(e)}")
-
-# ============================================
-# GEMINI IMAGE GENERATION
-# ============================================
-
-def build_renovation_prompt(request: RenovationRequest) -> str:
-    """Build an optimised prompt for image EDITING (not generation) with style and configuration toggles."""
-    
-    # Interior Design Style descriptions
-    # CRITICAL: These prompts must NEVER mention windows, doors, beams, fireplaces, flooring, or structural elements
-    # Flooring is controlled separately via the flooring toggle
-    # CRITICAL: Avoid specific furniture items (sofas, chairs, tables) - describe style aesthetic only to prevent inappropriate furniture being added to wrong room types
-    style_prompts = {
-        'english_contemporary': 'Transform this room into an English Contemporary style that balances traditional British sensibility with modern restraint. If there are sofas or armchairs, replace them with pieces featuring clean lines but with subtle curves, upholstered in rich textured fabrics like bouclé, heavyweight linen, or soft wool in warm neutrals such as oatmeal, warm grey, soft camel, or muted olive. If there is a bed, change it to an upholstered frame with a gently curved or subtly winged headboard in a textured neutral fabric, dressed with layered white and cream linens with a structured throw in a heritage colour like burnt sienna or forest green. If there are dining chairs, update them to be elegantly simple with gentle curves, perhaps in oak or walnut with linen seat cushions. If there are side tables or coffee tables, replace with pieces in warm-toned timber like oak or walnut with refined proportions, possibly with subtle brass or aged bronze detailing. If there are lamps, change to ceramic table lamps with organic shapes in cream, sage, or warm terracotta with natural linen shades, or sculptural floor lamps with brass stems and fabric shades. If there are curtains or window treatments, replace with full-length linen or wool curtains in soft cream, warm grey, or muted green that puddle slightly on the floor. If there is a rug, change to a high-quality wool rug in a subtle tone-on-tone pattern or solid neutral with interesting texture. If there are bookshelves or storage units, replace with built-in cabinetry painted in warm off-white or soft grey-green, or freestanding pieces in natural timber with brass hardware. Paint walls in warm whites like plaster pink, pale putty, or soft stone. If there are mirrors, update to simple frames in aged brass, warm bronze, or natural timber. Replace any harsh overhead lighting with warm ambient sources. Add texture through the contrast of smooth plaster walls against natural linen, wool textiles, and matte timber surfaces. The overall effect should feel collected, intelligent, quietly luxurious, and effortlessly refined without feeling decorated.',
-
-        'modern_organic': 'Transform this room into a Modern Organic style that celebrates natural materials, sculptural forms, and an earthy, grounded aesthetic. If there are sofas or armchairs, replace them with low-profile pieces featuring curved, embracing silhouettes upholstered in natural fabrics like undyed linen, hemp, raw cotton, or soft leather in tones of warm sand, clay, terracotta, soft mushroom, or warm cream. If there is a bed, change it to a low platform style in solid timber with visible grain, perhaps with a curved or rounded headboard in natural wood or upholstered in a textural fabric, dressed with stonewashed linen bedding in earthy neutrals layered with a chunky knit or handwoven throw. If there are dining chairs, update them to sculptural wooden pieces with organic curves and visible joinery, or woven designs using natural rattan, cane, or rope seats. If there are coffee tables or side tables, replace with sculptural pieces in raw-edged timber, travertine, cast concrete, or hand-carved stone with organic shapes and natural imperfections celebrated rather than hidden. If there are lamps, change to sculptural ceramic pieces with unglazed or matte finishes in cream, terracotta, or charcoal, paper lantern styles, or organic sculptural forms in alabaster or natural stone. If there are curtains, replace with relaxed, unlined linen panels in natural off-white or warm sand that filter light softly. If there is a rug, change to a handwoven jute, sisal, or wool piece with visible texture, perhaps in a natural tone or soft terracotta, or a vintage Berber or Beni Ourain style with organic patterns. If there are shelving units, replace with floating timber shelves with live edges or recessed niches with limewash plaster walls to display ceramic vessels and found natural objects. Apply limewash or microcement in warm earth tones like soft terracotta, warm sand, or pale clay to walls for depth and natural texture. If there are mirrors, update to organic asymmetrical shapes or pieces framed in raw timber or wrapped in natural rope. Replace any standard lighting with warm, diffused sources. Incorporate natural textures throughout: raw linen, unpolished stone, handmade ceramics, woven baskets, and dried botanical elements. The overall effect should feel rooted, tactile, warmly primitive, and connected to the earth while maintaining contemporary sophistication.',
+        # Log the full error for debugging; the client only gets a stable message
+        print(f"[ERROR] Scraper failed for {url}: {type(e).__name__}: {e}")
+        traceback.print_exc()
+        raise HTTPException(status_code=500, detail="Failed to scrape property")
 
-        'scandinavian_minimalism': 'Transform this room into a Scandinavian Minimalist style that embodies functional simplicity, quiet beauty, and a sense of calm restraint. If there are sofas or armchairs, replace them with clean-lined pieces in pale grey, soft white, warm sand, or muted sage, upholstered in quality natural fabrics like bouclé, wool, or heavy cotton, with exposed wooden legs in pale ash, light oak, or birch. If there is a bed, change it to a simple timber frame in pale natural wood like ash or whitewashed oak with clean geometric lines, dressed with pure white or soft grey linen bedding, layered simply with a single textural wool throw in cream or soft grey. If there are dining chairs, update them to iconic Scandinavian designs featuring bent plywood, pale timber, and gentle curves, prioritising ergonomic beauty and craftsmanship. If there are coffee tables or side tables, replace with simple geometric forms in pale oak, ash, or birch with exceptional joinery and smooth surfaces, or paired with white marble or pale concrete. If there are lamps, change to sculptural modern designs in matte white, pale grey, or natural timber, with simple geometric or organic forms like pendant lights with opal glass globes, minimalist floor lamps with slim profiles, or paper lanterns. If there are curtains, replace with sheer white linen panels that maximise natural light while softening the windows, or simple roller blinds in white or pale grey. If there is a rug, change to a flat-weave wool rug in pale grey, cream, or soft white with minimal pattern, or a natural wool sheepskin for textural warmth. If there are storage units, replace with clean-lined pieces in white with timber accents, or pale timber cabinets with handleless fronts emphasising uninterrupted surfaces. Paint all walls in pure white or the softest warm grey to maximise light reflection. If there are mirrors, update to simple round or rectangular shapes with thin pale timber frames or frameless designs. Replace all lighting with warm white sources around 2700K to create hygge warmth. Reduce visual clutter dramatically, leaving only essential pieces and a few carefully chosen objects of functional beauty. The overall effect should feel serene, light-filled, thoughtfully edited, and quietly beautiful, where every object earns its place through both function and aesthetic contribution.',
 
-        'japandi': 'Transform this room into a Japandi style that fuses Japanese wabi-sabi philosophy with Scandinavian functionality, creating a serene, soulful, and impeccably considered space. If there are sofas or armchairs, replace them with low-profile pieces featuring clean geometric lines softened by subtle curves, upholstered in natural fabrics like heavyweight linen, cotton, or wool in warm neutrals such as charcoal, warm grey, soft ecru, or muted moss green, with exposed frames in dark walnut, smoked oak, or blackened timber. If there is a bed, change it to a low platform frame close to the ground in dark-stained walnut, charcoal oak, or natural light timber with strong horizontal lines and minimal ornamentation, dressed with natural linen bedding in cream, soft grey, or warm white with a single textural throw in a complementary natural tone. If there are dining chairs, update them to refined timber designs with woven paper cord, rush, or leather seats in the Danish tradition, or low Japanese-inspired stools in dark wood with subtle craftsmanship details. If there are coffee tables or side tables, replace with low, grounded pieces in dark timber with visible grain or natural stone like grey granite or dark slate, featuring clean lines and subtle asymmetry that embraces imperfection. If there are lamps, change to sculptural pieces in handmade ceramics with natural glazes in cream, grey, or black, rice paper lanterns, or simple timber and metal designs with warm diffused light. If there are curtains, replace with simple linen panels in natural cream or soft charcoal, hung simply from minimal hardware, or rice paper screens for filtered light. If there is a rug, change to a low-pile wool piece in charcoal, cream, or natural undyed wool with subtle texture, or a traditional tatami-inspired natural fibre mat. If there are storage units, replace with pieces featuring sliding doors or push-to-open mechanisms to eliminate visible hardware, in dark timber or combinations of dark wood with cream or paper panels. Apply walls in soft limewash in warm cream, pale grey, or soft charcoal, or leave as natural plaster with subtle texture. If there are mirrors, update to simple shapes framed in dark timber or blackened metal with clean lines. Embrace negative space deliberately, leaving breathing room around furniture and art. Include handcrafted objects that show the maker\'s hand: ceramics with irregular glazes, hand-thrown pottery, or timber pieces with visible joinery. The overall effect should feel contemplative, quietly sophisticated, grounded, and infused with the beauty of restraint, imperfection, and natural materials.',
+async def _scrape_batch_item(url: str) -> BatchPropertyResult:
+    """Scrape one URL of a batch, converting failures into an error entry."""
+    try:
+        return BatchPropertyResult(url=url, property=await get_property_from_rightmove(url))
+    except HTTPException as e:
+        return BatchPropertyResult(url=url, error=e.detail)
+    except Exception as e:
+        print(f"[ERROR] Batch scrape failed for {url}: {type(e).__name__}: {e}")
+        return BatchPropertyResult(url=url, error="Failed to scrape property")
 
-        'parisian_classic': 'Transform this room into a Parisian Classic style that evokes the timeless elegance of Haussmann-era apartments with their romantic tension between ornate heritage and confident modern living. If there are sofas or armchairs, replace them with elegant French silhouettes featuring curved arms, turned legs, and refined proportions, upholstered in luxurious fabrics like velvet, silk, or fine linen in sophisticated tones such as deep navy, soft blush, warm grey, cream, or muted gold, with frames in gilded wood, painted white, or natural oak showing gentle wear. If there is a bed, change it to an upholstered frame with a tall, dramatic headboard in buttoned velvet or linen in soft grey, blush, or cream, or an ornate antique frame in painted white or gilded wood, dressed with crisp white cotton sheets layered with soft quilted coverlets and plush cushions. If there are dining chairs, update them to Louis XV or XVI inspired designs with cabriole legs and cane or upholstered backs in velvet or linen, mixing matched sets with occasional collected antique pieces. If there are coffee tables or side tables, replace with antique or antique-inspired pieces featuring marble tops, gilded bases, carved timber, or elegant brass and glass combinations with ornate detailing. If there are lamps, change to crystal or brass chandeliers, elegant sconces with fabric shades, or classic table lamps with marble, brass, or ceramic bases and pleated silk shades in cream or soft colours. If there are curtains, replace with full, generous panels in silk, velvet, or heavy linen in cream, soft grey, or muted colours, hung high near the ceiling and puddling gracefully on the floor, perhaps with subtle tiebacks. If there is a rug, change to an antique or vintage-inspired piece, perhaps an Aubusson, Persian, or French needlepoint design in soft, faded colours with ornate patterns. If there are bookcases or storage, replace with ornate carved pieces in painted white or natural timber, or built-in shelving with classical moulding details. Apply soft, sophisticated paint colours to walls: soft grey, pale French blue, antique white, or soft blush, with decorative mouldings, cornices, and panelling emphasised through subtle tonal contrast. If there are mirrors, update to ornate gilded frames, large-scale antique pieces, or trumeau mirrors positioned to reflect light. Install herringbone parquet flooring if replacing floors. Layer in collected antique objects, vintage books, fresh flowers, and classical artwork in gilded frames. The overall effect should feel romantically elegant, intellectually sophisticated, confidently collected over time, and effortlessly glamorous without feeling museum-like or precious.',
 
-        'coastal_elevated': 'Transform this room into an Elevated Coastal style that evokes the sophistication of a refined seaside residence, moving far beyond typical nautical clichés to embrace the natural beauty, light, and serenity of coastal living with quiet luxury. If there are sofas or armchairs, replace them with relaxed yet refined pieces featuring clean lines with soft, sink-in comfort, upholstered in high-quality natural fabrics like heavy linen, cotton, or soft bouclé in tones of warm white, soft sand, pale grey, weathered blue, or soft seafoam green, with exposed legs in natural pale timber, whitewashed wood, or weathered grey oak. If there is a bed, change it to an elegant frame in natural timber, whitewashed wood, or upholstered in natural linen with a relaxed headboard, dressed with crisp white linen bedding layered with soft blue or sandy neutral throws and European pillows in natural textures. If there are dining chairs, update them to relaxed elegant designs in natural rattan, woven rope, or pale timber with linen cushions in soft neutrals, mixing organic textures with refined lines. If there are coffee tables or side tables, replace with pieces in natural materials like driftwood-inspired timber, white marble, natural stone, or cerused oak with organic shapes or clean lines, perhaps incorporating natural elements like coral-inspired forms or shell-textured surfaces. If there are lamps, change to sculptural pieces in natural materials like ceramic in sandy tones, woven rattan pendants, organic glass forms in soft blue or clear tones, or brass with weathered patina, all with natural linen or parchment shades creating warm, diffused light. If there are curtains, replace with billowing sheer linen panels in white or natural cream that move gently with air, hung generously to maximise the sense of light and air. If there is a rug, change to natural sisal, jute, or seagrass for organic texture, or soft wool in sandy neutrals or soft blue with subtle patterns reminiscent of water or sand ripples. If there are storage units, replace with relaxed pieces in whitewashed timber, natural rattan, or white lacquer with organic textures and natural hardware in brass or bronze. Paint walls in warm whites, soft sandy neutrals, palest grey, or the softest hint of sea blue, using flat or matte finishes for natural depth. If there are mirrors, update to frames in weathered timber, natural rope, or simple brass that reference maritime heritage subtly. Incorporate natural coastal textures: linen, rope, woven fibres, bleached timber, shells, and coral-inspired ceramics as accents. Maximise the sense of light and air throughout. The overall effect should feel effortlessly sophisticated, serene, light-filled, and connected to the sea without any literal nautical references, like a beautifully appointed home that happens to sit by the ocean.',
+async def get_properties_batch(urls: list[str]) -> list[BatchPropertyResult]:
+    """
+    Scrape several Rightmove listings concurrently.
+    The shared scrape limiter bounds how many scrapes run at once so we don't hammer Rightmove.
+    Returns results in input order; each URL succeeds or fails independently.
+    """
+    return await asyncio.gather(*(_scrape_batch_item(url) for url in urls))
 
-        'midcentury_modern': 'Transform this room into a Mid-Century Modern style that captures the optimistic, design-forward spirit of the 1950s and 1960s with its celebration of clean lines, organic forms, and innovative craftsmanship. If there are sofas or armchairs, replace them with iconic low-profile silhouettes featuring tapered legs in walnut or teak, clean geometric or organic curved forms, and upholstery in period-appropriate fabrics like wool, leather, or textured cotton in warm earth tones such as burnt orange, mustard yellow, olive green, warm brown, or charcoal grey, or in classic neutrals with a pop of colour on accent chairs. If there is a bed, change it to a low platform design with a slim, geometric headboard in warm-toned timber like walnut, teak, or rosewood veneer, with tapered legs and minimal ornamentation, dressed with simple bedding in warm neutrals accented with a bold graphic throw or cushion. If there are dining chairs, update them to iconic designs featuring moulded plywood, fibreglass shells, or elegant timber frames with organic curves and minimal profiles, showcasing the era\'s innovative materials and manufacturing techniques. If there are coffee tables or side tables, replace with classic designs featuring sculptural timber bases, organic kidney or surfboard shapes, glass tops with angled legs, or sleek low profiles in walnut, teak, or rosewood with brass or hairpin leg details. If there are lamps, change to iconic designs of the era: arc floor lamps, Sputnik chandeliers, globe pendants, mushroom table lamps, or sculptural ceramic pieces in period colours, all emphasising form as art. If there are curtains, replace with simple flat panels in solid colours or bold geometric patterns characteristic of the era, or leave windows unadorned to maximise the indoor-outdoor connection. If there is a rug, change to a bold geometric or abstract pattern in warm period colours like orange, gold, olive, and brown, or a high-quality shag rug in a solid warm tone for textural interest. If there are storage units, replace with credenzas, sideboards, or wall units in warm timber with clean lines, tapered legs, and interesting hardware details in brass or chrome, featuring sliding doors, drop-down fronts, or open shelving sections. Apply warm white or soft cream to walls to let furniture stand as art, or add an accent wall in a bold period colour like mustard, teal, or burnt orange. If there are mirrors, update to simple geometric shapes like sunbursts or asymmetrical organic forms in brass or teak frames. Incorporate natural indoor plants, particularly architectural specimens like fiddle-leaf figs or monstera. Display vintage art, bold graphic prints, or abstract expressionist works. The overall effect should feel optimistic, artfully modern, warm yet sophisticated, and celebratory of the era\'s remarkable design innovation and craftsmanship.',
 
-        'moody_contemporary': 'Transform this room into a Moody Contemporary style that embraces bold darkness, dramatic sophistication, and the enveloping intimacy of richly saturated spaces while maintaining contemporary edge. If there are sofas or armchairs, replace them with sculptural contemporary pieces featuring bold proportions and interesting angles, upholstered in luxurious fabrics like velvet, heavy bouclé, or supple leather in deep dramatic tones such as charcoal, inky navy, forest green, burgundy, or pure black, with exposed frames in blackened metal, dark stained timber, or brass for contrast. If there is a bed, change it to a statement piece with a tall, dramatic upholstered headboard in deep velvet in charcoal, navy, or forest green, or a bold contemporary frame in blackened wood or metal, dressed with layered bedding in rich dark tones with textural throws and cushions in complementary deep colours. If there are dining chairs, update them to sculptural contemporary designs in dark leather, velvet, or heavy fabric with interesting structural details in blackened metal or dark timber, mixing matching sets with occasional statement pieces. If there are coffee tables or side tables, replace with bold contemporary pieces in dark marble like nero marquina, blackened steel, smoked glass, or dark-stained timber with architectural presence and interesting proportions. If there are lamps, change to sculptural statement pieces in blackened metal, dark glass, or marble with warm diffused light, dramatic oversized pendants, or contemporary sconces creating pools of light against dark walls. If there are curtains, replace with floor-to-ceiling panels in heavy velvet or wool in deep colours that absorb light and create intimacy, or dark linen for a slightly softer approach. If there is a rug, change to a high-quality piece in deep charcoal, black, or rich jewel tones with subtle texture or an abstract contemporary pattern in tonal darks. If there are storage units, replace with contemporary pieces featuring dark finishes, integrated lighting, and interesting proportions in blackened timber, dark lacquer, or metal with brass or bronze accent details. Paint walls in deeply saturated colours: charcoal, inky blue, forest green, deep burgundy, or pure black, using flat or matte finishes for depth. Consider dark ceiling treatment to create full envelopment. If there are mirrors, update to contemporary frames in blackened metal or antiqued glass that add depth without breaking the darkness. Layer lighting carefully with dimmers, creating pockets of warm light against the darkness. Add metallic accents in brass, bronze, or gold for warmth and reflected light. Incorporate luxurious textures in velvet, fur, heavy linen, and leather to add tactile richness. The overall effect should feel dramatically sophisticated, intimately cocooning, boldly confident, and unexpectedly comforting in its embrace of darkness.',
+async def stream_properties(urls: list[str]) -> AsyncIterator[BatchPropertyResult]:
+    """
+    Scrape several Rightmove listings concurrently, yielding each result as soon
+    as it finishes so one slow listing doesn't hold back the rest.
+    Scrapes go through the shared scrape limiter like every other endpoint.
+    """
+    tasks = [asyncio.create_task(_scrape_batch_item(url)) for url in urls]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+    finally:
+        # Client disconnected mid-stream - stop waiting on the remaining results.
+        # The scrapes themselves are shielded, so they still finish and other callers
+        # sharing them, and the listing cache, still get the result
+        for task in tasks:
+            task.cancel()
 
-        'rustic_modern': 'Transform this room into a Rustic Modern style that harmonises raw, natural, heritage-rich elements with clean contemporary design, creating spaces that feel both rooted in history and entirely current. If there are sofas or armchairs, replace them with generously proportioned pieces featuring clean contemporary lines, upholstered in natural, substantial fabrics like heavyweight linen, thick cotton, or aged leather in warm earth tones such as caramel, warm brown, charcoal, cream, or soft terracotta, with frames that might incorporate reclaimed timber elements or blackened metal. If there is a bed, change it to a substantial frame in reclaimed timber showing natural wear, aged patina, and honest joinery, or a contemporary iron frame with rustic warmth, dressed with natural linen bedding in cream or soft neutrals layered with chunky knit throws and textural cushions in earthy tones. If there are dining chairs, update them to honest, substantial designs mixing vintage character pieces like old wooden farmhouse chairs or industrial metal stools with contemporary wooden designs, embracing mismatched character over matched perfection. If there are coffee tables or side tables, replace with pieces celebrating natural materials: reclaimed timber with live edges or visible history, raw stone or concrete with natural imperfections, or blackened metal with honest construction, showing craftsmanship and material authenticity. If there are lamps, change to pieces featuring natural materials like turned timber, handmade ceramics with rustic glazes, or industrial blackened metal with exposed bulbs or natural fabric shades, creating warm pools of light. If there are curtains, replace with relaxed natural linen panels in undyed or soft neutral tones, hung simply and left unpressed for natural texture. If there is a rug, change to a natural jute or sisal piece for organic texture, a vintage kilim or antique rug with faded character, or a handwoven wool piece in natural earth tones. If there are storage units, replace with pieces combining raw materials: reclaimed timber and blackened metal, weathered wood with contemporary hardware, or vintage industrial pieces repurposed for modern living. Apply walls in natural plaster with visible texture and imperfection, limewash in warm earth tones, or simple white to let natural materials stand out. Expose any existing architectural bones: timber beams, brick walls, stone features. If there are mirrors, update to simple frames in reclaimed timber, blackened metal, or left unframed for contemporary edge against rustic materials. Incorporate patina and age throughout: vintage finds, antique tools as decoration, collected natural objects, and inherited pieces with stories. The overall effect should feel warmly authentic, honestly crafted, connected to the land and to history, while remaining edited, contemporary, and sophisticated in its restraint.',
+# ============================================
+# GEMINI IMAGE GENERATION
+# ============================================
 
-        'hals_choice': 'Transform this room into a warm contemporary English home interior. Traditional wainscoting and wall panelling with raised or recessed panels at dado rail height, not modern vertical slats. Natural oak and walnut wood tones for flooring and furniture. Sage green and forest green for painted panelling. Cream and off-white walls above the dado rail. Herringbone hardwood floors in warm oak tones. Built-in floor-to-ceiling bookshelves where appropriate. Abundant natural light through windows (no skylights). Warm ambient lighting with brass wall sconces and aged bronze fixtures. Layered, lived-in feel with curated art including Keith Haring pieces in gilt and dark wood frames. No stark whites, no grey tones, no minimalist aesthetic, no modern vertical wood slats. Traditional architectural details preserved. Photography style: editorial interiors, soft natural light, shot on medium format. HALLWAY/ENTRY SPECIFIC: If this is a hallway, apply the following: Traditional English hallway with painted wainscoting panels at dado height in forest green or deep sage. Cream or warm white walls above. Herringbone oak flooring in warm honey tones. Arched mirror with dark or antiqued frame. Console table in dark wood or black metal with ceramic table lamp. Upholstered bench or stool beneath. Smoked glass globe pendant light. Internal doors painted to match panelling. Gallery of black and white photography in dark frames ascending stairway. Single large plant in terracotta pot. Vintage runner rug acceptable in entry only. Keith Haring artwork as accent piece. Warm, moody, welcoming. No skylights, no vertical slats. STAIRCASE SPECIFIC: If this is a staircase, apply the following: Traditional English staircase with painted wainscoting panels following the stair line in forest green or deep sage. Balustrade and newel post painted to match. Cream or warm white walls above dado. Natural wool stair runner in warm rust/terracotta tones or oatmeal with dark binding. Gallery wall ascending with Keith Haring pieces alongside black and white photography in dark frames. Brass stair rods optional. Warm natural light. Classic, layered, storied. No skylights. KITCHEN SPECIFIC: If this is a kitchen, apply the following: Warm contemporary kitchen with natural oak or walnut cabinetry, no painted cabinets. Vertical sage green or teal subway tile backsplash. White marble or light stone countertops with warm veining. Traditional painted wainscoting panels on feature wall in sage or cream. Smoked oak herringbone flooring. Open wooden shelving with ceramics and cookbooks. Brass or bronze hardware and fixtures. Integrated appliances. A single statement pendant light. Keith Haring print or artwork on display. Warm, inviting, timeless. No skylights. BATHROOM SPECIFIC (Main/Family): If this is a bathroom, apply the following: Warm contemporary bathroom with sage green or olive subway tile as dado, extending floor to ceiling in shower/bath area with arched shower screen or alcove in brass frame. Cream or warm plaster walls above tile. Natural oak vanity with shaker-style drawers and brass knobs. White stone or marble countertop with undermount basin. Large arched or rounded-corner mirror with brass frame. Brass wall sconces flanking mirror. Wall-mounted brass shower fixtures and taps. Large format stone floor tiles in warm cream or limestone tones. Small gilt-framed landscape paintings on walls. Fresh flowers in vase on vanity. Keith Haring small print as unexpected accent. Warm, spa-like but characterful, not clinical. No skylights. BATHROOM SPECIFIC (Cloakroom/WC): If this is a cloakroom or powder room, apply the following: Traditional cloakroom with decorative wallpaper above dado in botanical or damask pattern, sage/cream/charcoal tones. Painted tongue-and-groove or beadboard panelling below in pale sage or cream. Small oak or painted vanity unit with marble top. Brass taps and fixtures. Oval or round mirror in gilt or dark wood frame. Single brass wall sconce. Warm stone or encaustic tile floor. Woven basket for storage. Small wooden stool or shelf for towels. Fresh plant or flowers. Cottage-meets-collected feel. No skylights. LIVING ROOM SPECIFIC: If this is a living room, apply the following: Warm contemporary living room with traditional wainscoting panels at dado height, painted sage green or cream. Deep green or warm cream painted walls above. Built-in floor-to-ceiling bookshelves flanking doorway or fireplace. Herringbone oak flooring. Warm beige-grey Togo sofa as centrepiece, low and sculptural. Layered brass and ceramic table lamps. Gallery wall with Keith Haring artwork as focal point alongside eclectic framed pieces. Warm afternoon light. Brass curtain rods with linen curtains. Books stacked on coffee table. Cultivated, literary, inviting. No skylights, no vertical slats. DINING ROOM SPECIFIC: If this is a dining room, apply the following: Warm contemporary dining room with traditional wainscoting panels at dado height, painted sage or forest green. Cream walls above. Solid oak or walnut dining table with natural grain, rectangular, seats 6-8. Cesca chairs in natural cane and chrome surrounding the table. Built-in sideboard or credenza in matching wood tones. Statement pendant light in brass or woven material above table. Gallery wall featuring Keith Haring prints prominently alongside gilt-framed landscapes and photography. Herringbone oak flooring. Brass candlesticks on table. Large ceramic vase with branches or greenery. Soft linen curtains. Editorial, collected, convivial. No skylights, no vertical slats.',
-    }
+# Interior Design Style descriptions
+# CRITICAL: These prompts must NEVER mention windows, doors, beams, fireplaces, flooring, or structural elements
+# Flooring is controlled separately via the flooring toggle
+# CRITICAL: Avoid specific furniture items (sofas, chairs, tables) - describe style aesthetic only to prevent inappropriate furniture being added to wrong room types
+STYLE_PROMPTS = MappingProxyType({
+    'english_contemporary': 'Transform this room into an English Contemporary style that balances traditional British sensibility with modern restraint. If there are sofas or armchairs, replace them with pieces featuring clean lines but with subtle curves, upholstered in rich textured fabrics like bouclé, heavyweight linen, or soft wool in warm neutrals such as oatmeal, warm grey, soft camel, or muted olive. If there is a bed, change it to an upholstered frame with a gently curved or subtly winged headboard in a textured neutral fabric, dressed with layered white and cream linens with a structured throw in a heritage colour like burnt sienna or forest green. If there are dining chairs, update them to be elegantly simple with gentle curves, perhaps in oak or walnut with linen seat cushions. If there are side tables or coffee tables, replace with pieces in warm-toned timber like oak or walnut with refined proportions, possibly with subtle brass or aged bronze detailing. If there are lamps, change to ceramic table lamps with organic shapes in cream, sage, or warm terracotta with natural linen shades, or sculptural floor lamps with brass stems and fabric shades. If there are curtains or window treatments, replace with full-length linen or wool curtains in soft cream, warm grey, or muted green that puddle slightly on the floor. If there is a rug, change to a high-quality wool rug in a subtle tone-on-tone pattern or solid neutral with interesting texture. If there are bookshelves or storage units, replace with built-in cabinetry painted in warm off-white or soft grey-green, or freestanding pieces in natural timber with brass hardware. Paint walls in warm whites like plaster pink, pale putty, or soft stone. If there are mirrors, update to simple frames in aged brass, warm bronze, or natural timber. Replace any harsh overhead lighting with warm ambient sources. Add texture through the contrast of smooth plaster walls against natural linen, wool textiles, and matte timber surfaces. The overall effect should feel collected, intelligent, quietly luxurious, and effortlessly refined without feeling decorated.',
+
+    'modern_organic': 'Transform this room into a Modern Organic style that celebrates natural materials, sculptural forms, and an earthy, grounded aesthetic. If there are sofas or armchairs, replace them with low-profile pieces featuring curved, embracing silhouettes upholstered in natural fabrics like undyed linen, hemp, raw cotton, or soft leather in tones of warm sand, clay, terracotta, soft mushroom, or warm cream. If there is a bed, change it to a low platform style in solid timber with visible grain, perhaps with a curved or rounded headboard in natural wood or upholstered in a textural fabric, dressed with stonewashed linen bedding in earthy neutrals layered with a chunky knit or handwoven throw. If there are dining chairs, update them to sculptural wooden pieces with organic curves and visible joinery, or woven designs using natural rattan, cane, or rope seats. If there are coffee tables or side tables, replace with sculptural pieces in raw-edged timber, travertine, cast concrete, or hand-carved stone with organic shapes and natural imperfections celebrated rather than hidden. If there are lamps, change to sculptural ceramic pieces with unglazed or matte finishes in cream, terracotta, or charcoal, paper lantern styles, or organic sculptural forms in alabaster or natural stone. If there are curtains, replace with relaxed, unlined linen panels in natural off-white or warm sand that filter light softly. If there is a rug, change to a handwoven jute, sisal, or wool piece with visible texture, perhaps in a natural tone or soft terracotta, or a vintage Berber or Beni Ourain style with organic patterns. If there are shelving units, replace with floating timber shelves with live edges or recessed niches with limewash plaster walls to display ceramic vessels and found natural objects. Apply limewash or microcement in warm earth tones like soft terracotta, warm sand, or pale clay to walls for depth and natural texture. If there are mirrors, update to organic asymmetrical shapes or pieces framed in raw timber or wrapped in natural rope. Replace any standard lighting with warm, diffused sources. Incorporate natural textures throughout: raw linen, unpolished stone, handmade ceramics, woven baskets, and dried botanical elements. The overall effect should feel rooted, tactile, warmly primitive, and connected to the earth while maintaining contemporary sophistication.',
+
+    'scandinavian_minimalism': 'Transform this room into a Scandinavian Minimalist style that embodies functional simplicity, quiet beauty, and a sense of calm restraint. If there are sofas or armchairs, replace them with clean-lined pieces in pale grey, soft white, warm sand, or muted sage, upholstered in quality natural fabrics like bouclé, wool, or heavy cotton, with exposed wooden legs in pale ash, light oak, or birch. If there is a bed, change it to a simple timber frame in pale natural wood like ash or whitewashed oak with clean geometric lines, dressed with pure white or soft grey linen bedding, layered simply with a single textural wool throw in cream or soft grey. If there are dining chairs, update them to iconic Scandinavian designs featuring bent plywood, pale timber, and gentle curves, prioritising ergonomic beauty and craftsmanship. If there are coffee tables or side tables, replace with simple geometric forms in pale oak, ash, or birch with exceptional joinery and smooth surfaces, or paired with white marble or pale concrete. If there are lamps, change to sculptural modern designs in matte white, pale grey, or natural timber, with simple geometric or organic forms like pendant lights with opal glass globes, minimalist floor lamps with slim profiles, or paper lanterns. If there are curtains, replace with sheer white linen panels that maximise natural light while softening the windows, or simple roller blinds in white or pale grey. If there is a rug, change to a flat-weave wool rug in pale grey, cream, or soft white with minimal pattern, or a natural wool sheepskin for textural warmth. If there are storage units, replace with clean-lined pieces in white with timber accents, or pale timber cabinets with handleless fronts emphasising uninterrupted surfaces. Paint all walls in pure white or the softest warm grey to maximise light reflection. If there are mirrors, update to simple round or rectangular shapes with thin pale timber frames or frameless designs. Replace all lighting with warm white sources around 2700K to create hygge warmth. Reduce visual clutter dramatically, leaving only essential pieces and a few carefully chosen objects of functional beauty. The overall effect should feel serene, light-filled, thoughtfully edited, and quietly beautiful, where every object earns its place through both function and aesthetic contribution.',
+
+    'japandi': 'Transform this room into a Japandi style that fuses Japanese wabi-sabi philosophy with Scandinavian functionality, creating a serene, soulful, and impeccably considered space. If there are sofas or armchairs, replace them with low-profile pieces featuring clean geometric lines softened by subtle curves, upholstered in natural fabrics like heavyweight linen, cotton, or wool in warm neutrals such as charcoal, warm grey, soft ecru, or muted moss green, with exposed frames in dark walnut, smoked oak, or blackened timber. If there is a bed, change it to a low platform frame close to the ground in dark-stained walnut, charcoal oak, or natural light timber with strong horizontal lines and minimal ornamentation, dressed with natural linen bedding in cream, soft grey, or warm white with a single textural throw in a complementary natural tone. If there are dining chairs, update them to refined timber designs with woven paper cord, rush, or leather seats in the Danish tradition, or low Japanese-inspired stools in dark wood with subtle craftsmanship details. If there are coffee tables or side tables, replace with low, grounded pieces in dark timber with visible grain or natural stone like grey granite or dark slate, featuring clean lines and subtle asymmetry that embraces imperfection. If there are lamps, change to sculptural pieces in handmade ceramics with natural glazes in cream, grey, or black, rice paper lanterns, or simple timber and metal designs with warm diffused light. If there are curtains, replace with simple linen panels in natural cream or soft charcoal, hung simply from minimal hardware, or rice paper screens for filtered light. If there is a rug, change to a low-pile wool piece in charcoal, cream, or natural undyed wool with subtle texture, or a traditional tatami-inspired natural fibre mat. If there are storage units, replace with pieces featuring sliding doors or push-to-open mechanisms to eliminate visible hardware, in dark timber or combinations of dark wood with cream or paper panels. Apply walls in soft limewash in warm cream, pale grey, or soft charcoal, or leave as natural plaster with subtle texture. If there are mirrors, update to simple shapes framed in dark timber or blackened metal with clean lines. Embrace negative space deliberately, leaving breathing room around furniture and art. Include handcrafted objects that show the maker\'s hand: ceramics with irregular glazes, hand-thrown pottery, or timber pieces with visible joinery. The overall effect should feel contemplative, quietly sophisticated, grounded, and infused with the beauty of restraint, imperfection, and natural materials.',
+
+    'parisian_classic': 'Transform this room into a Parisian Classic style that evokes the timeless elegance of Haussmann-era apartments with their romantic tension between ornate heritage and confident modern living. If there are sofas or armchairs, replace them with elegant French silhouettes featuring curved arms, turned legs, and refined proportions, upholstered in luxurious fabrics like velvet, silk, or fine linen in sophisticated tones such as deep navy, soft blush, warm grey, cream, or muted gold, with frames in gilded wood, painted white, or natural oak showing gentle wear. If there is a bed, change it to an upholstered frame with a tall, dramatic headboard in buttoned velvet or linen in soft grey, blush, or cream, or an ornate antique frame in painted white or gilded wood, dressed with crisp white cotton sheets layered with soft quilted coverlets and plush cushions. If there are dining chairs, update them to Louis XV or XVI inspired designs with cabriole legs and cane or upholstered backs in velvet or linen, mixing matched sets with occasional collected antique pieces. If there are coffee tables or side tables, replace with antique or antique-inspired pieces featuring marble tops, gilded bases, carved timber, or elegant brass and glass combinations with ornate detailing. If there are lamps, change to crystal or brass chandeliers, elegant sconces with fabric shades, or classic table lamps with marble, brass, or ceramic bases and pleated silk shades in cream or soft colours. If there are curtains, replace with full, generous panels in silk, velvet, or heavy linen in cream, soft grey, or muted colours, hung high near the ceiling and puddling gracefully on the floor, perhaps with subtle tiebacks. If there is a rug, change to an antique or vintage-inspired piece, perhaps an Aubusson, Persian, or French needlepoint design in soft, faded colours with ornate patterns. If there are bookcases or storage, replace with ornate carved pieces in painted white or natural timber, or built-in shelving with classical moulding details. Apply soft, sophisticated paint colours to walls: soft grey, pale French blue, antique white, or soft blush, with decorative mouldings, cornices, and panelling emphasised through subtle tonal contrast. If there are mirrors, update to ornate gilded frames, large-scale antique pieces, or trumeau mirrors positioned to reflect light. Install herringbone parquet flooring if replacing floors. Layer in collected antique objects, vintage books, fresh flowers, and classical artwork in gilded frames. The overall effect should feel romantically elegant, intellectually sophisticated, confidently collected over time, and effortlessly glamorous without feeling museum-like or precious.',
+
+    'coastal_elevated': 'Transform this room into an Elevated Coastal style that evokes the sophistication of a refined seaside residence, moving far beyond typical nautical clichés to embrace the natural beauty, light, and serenity of coastal living with quiet luxury. If there are sofas or armchairs, replace them with relaxed yet refined pieces featuring clean lines with soft, sink-in comfort, upholstered in high-quality natural fabrics like heavy linen, cotton, or soft bouclé in tones of warm white, soft sand, pale grey, weathered blue, or soft seafoam green, with exposed legs in natural pale timber, whitewashed wood, or weathered grey oak. If there is a bed, change it to an elegant frame in natural timber, whitewashed wood, or upholstered in natural linen with a relaxed headboard, dressed with crisp white linen bedding layered with soft blue or sandy neutral throws and European pillows in natural textures. If there are dining chairs, update them to relaxed elegant designs in natural rattan, woven rope, or pale timber with linen cushions in soft neutrals, mixing organic textures with refined lines. If there are coffee tables or side tables, replace with pieces in natural materials like driftwood-inspired timber, white marble, natural stone, or cerused oak with organic shapes or clean lines, perhaps incorporating natural elements like coral-inspired forms or shell-textured surfaces. If there are lamps, change to sculptural pieces in natural materials like ceramic in sandy tones, woven rattan pendants, organic glass forms in soft blue or clear tones, or brass with weathered patina, all with natural linen or parchment shades creating warm, diffused light. If there are curtains, replace with billowing sheer linen panels in white or natural cream that move gently with air, hung generously to maximise the sense of light and air. If there is a rug, change to natural sisal, jute, or seagrass for organic texture, or soft wool in sandy neutrals or soft blue with subtle patterns reminiscent of water or sand ripples. If there are storage units, replace with relaxed pieces in whitewashed timber, natural rattan, or white lacquer with organic textures and natural hardware in brass or bronze. Paint walls in warm whites, soft sandy neutrals, palest grey, or the softest hint of sea blue, using flat or matte finishes for natural depth. If there are mirrors, update to frames in weathered timber, natural rope, or simple brass that reference maritime heritage subtly. Incorporate natural coastal textures: linen, rope, woven fibres, bleached timber, shells, and coral-inspired ceramics as accents. Maximise the sense of light and air throughout. The overall effect should feel effortlessly sophisticated, serene, light-filled, and connected to the sea without any literal nautical references, like a beautifully appointed home that happens to sit by the ocean.',
+
+    'midcentury_modern': 'Transform this room into a Mid-Century Modern style that captures the optimistic, design-forward spirit of the 1950s and 1960s with its celebration of clean lines, organic forms, and innovative craftsmanship. If there are sofas or armchairs, replace them with iconic low-profile silhouettes featuring tapered legs in walnut or teak, clean geometric or organic curved forms, and upholstery in period-appropriate fabrics like wool, leather, or textured cotton in warm earth tones such as burnt orange, mustard yellow, olive green, warm brown, or charcoal grey, or in classic neutrals with a pop of colour on accent chairs. If there is a bed, change it to a low platform design with a slim, geometric headboard in warm-toned timber like walnut, teak, or rosewood veneer, with tapered legs and minimal ornamentation, dressed with simple bedding in warm neutrals accented with a bold graphic throw or cushion. If there are dining chairs, update them to iconic designs featuring moulded plywood, fibreglass shells, or elegant timber frames with organic curves and minimal profiles, showcasing the era\'s innovative materials and manufacturing techniques. If there are coffee tables or side tables, replace with classic designs featuring sculptural timber bases, organic kidney or surfboard shapes, glass tops with angled legs, or sleek low profiles in walnut, teak, or rosewood with brass or hairpin leg details. If there are lamps, change to iconic designs of the era: arc floor lamps, Sputnik chandeliers, globe pendants, mushroom table lamps, or sculptural ceramic pieces in period colours, all emphasising form as art. If there are curtains, replace with simple flat panels in solid colours or bold geometric patterns characteristic of the era, or leave windows unadorned to maximise the indoor-outdoor connection. If there is a rug, change to a bold geometric or abstract pattern in warm period colours like orange, gold, olive, and brown, or a high-quality shag rug in a solid warm tone for textural interest. If there are storage units, replace with credenzas, sideboards, or wall units in warm timber with clean lines, tapered legs, and interesting hardware details in brass or chrome, featuring sliding doors, drop-down fronts, or open shelving sections. Apply warm white or soft cream to walls to let furniture stand as art, or add an accent wall in a bold period colour like mustard, teal, or burnt orange. If there are mirrors, update to simple geometric shapes like sunbursts or asymmetrical organic forms in brass or teak frames. Incorporate natural indoor plants, particularly architectural specimens like fiddle-leaf figs or monstera. Display vintage art, bold graphic prints, or abstract expressionist works. The overall effect should feel optimistic, artfully modern, warm yet sophisticated, and celebratory of the era\'s remarkable design innovation and craftsmanship.',
+
+    'moody_contemporary': 'Transform this room into a Moody Contemporary style that embraces bold darkness, dramatic sophistication, and the enveloping intimacy of richly saturated spaces while maintaining contemporary edge. If there are sofas or armchairs, replace them with sculptural contemporary pieces featuring bold proportions and interesting angles, upholstered in luxurious fabrics like velvet, heavy bouclé, or supple leather in deep dramatic tones such as charcoal, inky navy, forest green, burgundy, or pure black, with exposed frames in blackened metal, dark stained timber, or brass for contrast. If there is a bed, change it to a statement piece with a tall, dramatic upholstered headboard in deep velvet in charcoal, navy, or forest green, or a bold contemporary frame in blackened wood or metal, dressed with layered bedding in rich dark tones with textural throws and cushions in complementary deep colours. If there are dining chairs, update them to sculptural contemporary designs in dark leather, velvet, or heavy fabric with interesting structural details in blackened metal or dark timber, mixing matching sets with occasional statement pieces. If there are coffee tables or side tables, replace with bold contemporary pieces in dark marble like nero marquina, blackened steel, smoked glass, or dark-stained timber with architectural presence and interesting proportions. If there are lamps, change to sculptural statement pieces in blackened metal, dark glass, or marble with warm diffused light, dramatic oversized pendants, or contemporary sconces creating pools of light against dark walls. If there are curtains, replace with floor-to-ceiling panels in heavy velvet or wool in deep colours that absorb light and create intimacy, or dark linen for a slightly softer approach. If there is a rug, change to a high-quality piece in deep charcoal, black, or rich jewel tones with subtle texture or an abstract contemporary pattern in tonal darks. If there are storage units, replace with contemporary pieces featuring dark finishes, integrated lighting, and interesting proportions in blackened timber, dark lacquer, or metal with brass or bronze accent details. Paint walls in deeply saturated colours: charcoal, inky blue, forest green, deep burgundy, or pure black, using flat or matte finishes for depth. Consider dark ceiling treatment to create full envelopment. If there are mirrors, update to contemporary frames in blackened metal or antiqued glass that add depth without breaking the darkness. Layer lighting carefully with dimmers, creating pockets of warm light against the darkness. Add metallic accents in brass, bronze, or gold for warmth and reflected light. Incorporate luxurious textures in velvet, fur, heavy linen, and leather to add tactile richness. The overall effect should feel dramatically sophisticated, intimately cocooning, boldly confident, and unexpectedly comforting in its embrace of darkness.',
+
+    'rustic_modern': 'Transform this room into a Rustic Modern style that harmonises raw, natural, heritage-rich elements with clean contemporary design, creating spaces that feel both rooted in history and entirely current. If there are sofas or armchairs, replace them with generously proportioned pieces featuring clean contemporary lines, upholstered in natural, substantial fabrics like heavyweight linen, thick cotton, or aged leather in warm earth tones such as caramel, warm brown, charcoal, cream, or soft terracotta, with frames that might incorporate reclaimed timber elements or blackened metal. If there is a bed, change it to a substantial frame in reclaimed timber showing natural wear, aged patina, and honest joinery, or a contemporary iron frame with rustic warmth, dressed with natural linen bedding in cream or soft neutrals layered with chunky knit throws and textural cushions in earthy tones. If there are dining chairs, update them to honest, substantial designs mixing vintage character pieces like old wooden farmhouse chairs or industrial metal stools with contemporary wooden designs, embracing mismatched character over matched perfection. If there are coffee tables or side tables, replace with pieces celebrating natural materials: reclaimed timber with live edges or visible history, raw stone or concrete with natural imperfections, or blackened metal with honest construction, showing craftsmanship and material authenticity. If there are lamps, change to pieces featuring natural materials like turned timber, handmade ceramics with rustic glazes, or industrial blackened metal with exposed bulbs or natural fabric shades, creating warm pools of light. If there are curtains, replace with relaxed natural linen panels in undyed or soft neutral tones, hung simply and left unpressed for natural texture. If there is a rug, change to a natural jute or sisal piece for organic texture, a vintage kilim or antique rug with faded character, or a handwoven wool piece in natural earth tones. If there are storage units, replace with pieces combining raw materials: reclaimed timber and blackened metal, weathered wood with contemporary hardware, or vintage industrial pieces repurposed for modern living. Apply walls in natural plaster with visible texture and imperfection, limewash in warm earth tones, or simple white to let natural materials stand out. Expose any existing architectural bones: timber beams, brick walls, stone features. If there are mirrors, update to simple frames in reclaimed timber, blackened metal, or left unframed for contemporary edge against rustic materials. Incorporate patina and age throughout: vintage finds, antique tools as decoration, collected natural objects, and inherited pieces with stories. The overall effect should feel warmly authentic, honestly crafted, connected to the land and to history, while remaining edited, contemporary, and sophisticated in its restraint.',
+
+    'hals_choice': 'Transform this room into a warm contemporary English home interior. Traditional wainscoting and wall panelling with raised or recessed panels at dado rail height, not modern vertical slats. Natural oak and walnut wood tones for flooring and furniture. Sage green and forest green for painted panelling. Cream and off-white walls above the dado rail. Herringbone hardwood floors in warm oak tones. Built-in floor-to-ceiling bookshelves where appropriate. Abundant natural light through windows (no skylights). Warm ambient lighting with brass wall sconces and aged bronze fixtures. Layered, lived-in feel with curated art including Keith Haring pieces in gilt and dark wood frames. No stark whites, no grey tones, no minimalist aesthetic, no modern vertical wood slats. Traditional architectural details preserved. Photography style: editorial interiors, soft natural light, shot on medium format. HALLWAY/ENTRY SPECIFIC: If this is a hallway, apply the following: Traditional English hallway with painted wainscoting panels at dado height in forest green or deep sage. Cream or warm white walls above. Herringbone oak flooring in warm honey tones. Arched mirror with dark or antiqued frame. Console table in dark wood or black metal with ceramic table lamp. Upholstered bench or stool beneath. Smoked glass globe pendant light. Internal doors painted to match panelling. Gallery of black and white photography in dark frames ascending stairway. Single large plant in terracotta pot. Vintage runner rug acceptable in entry only. Keith Haring artwork as accent piece. Warm, moody, welcoming. No skylights, no vertical slats. STAIRCASE SPECIFIC: If this is a staircase, apply the following: Traditional English staircase with painted wainscoting panels following the stair line in forest green or deep sage. Balustrade and newel post painted to match. Cream or warm white walls above dado. Natural wool stair runner in warm rust/terracotta tones or oatmeal with dark binding. Gallery wall ascending with Keith Haring pieces alongside black and white photography in dark frames. Brass stair rods optional. Warm natural light. Classic, layered, storied. No skylights. KITCHEN SPECIFIC: If this is a kitchen, apply the following: Warm contemporary kitchen with natural oak or walnut cabinetry, no painted cabinets. Vertical sage green or teal subway tile backsplash. White marble or light stone countertops with warm veining. Traditional painted wainscoting panels on feature wall in sage or cream. Smoked oak herringbone flooring. Open wooden shelving with ceramics and cookbooks. Brass or bronze hardware and fixtures. Integrated appliances. A single statement pendant light. Keith Haring print or artwork on display. Warm, inviting, timeless. No skylights. BATHROOM SPECIFIC (Main/Family): If this is a bathroom, apply the following: Warm contemporary bathroom with sage green or olive subway tile as dado, extending floor to ceiling in shower/bath area with arched shower screen or alcove in brass frame. Cream or warm plaster walls above tile. Natural oak vanity with shaker-style drawers and brass knobs. White stone or marble countertop with undermount basin. Large arched or rounded-corner mirror with brass frame. Brass wall sconces flanking mirror. Wall-mounted brass shower fixtures and taps. Large format stone floor tiles in warm cream or limestone tones. Small gilt-framed landscape paintings on walls. Fresh flowers in vase on vanity. Keith Haring small print as unexpected accent. Warm, spa-like but characterful, not clinical. No skylights. BATHROOM SPECIFIC (Cloakroom/WC): If this is a cloakroom or powder room, apply the following: Traditional cloakroom with decorative wallpaper above dado in botanical or damask pattern, sage/cream/charcoal tones. Painted tongue-and-groove or beadboard panelling below in pale sage or cream. Small oak or painted vanity unit with marble top. Brass taps and fixtures. Oval or round mirror in gilt or dark wood frame. Single brass wall sconce. Warm stone or encaustic tile floor. Woven basket for storage. Small wooden stool or shelf for towels. Fresh plant or flowers. Cottage-meets-collected feel. No skylights. LIVING ROOM SPECIFIC: If this is a living room, apply the following: Warm contemporary living room with traditional wainscoting panels at dado height, painted sage green or cream. Deep green or warm cream painted walls above. Built-in floor-to-ceiling bookshelves flanking doorway or fireplace. Herringbone oak flooring. Warm beige-grey Togo sofa as centrepiece, low and sculptural. Layered brass and ceramic table lamps. Gallery wall with Keith Haring artwork as focal point alongside eclectic framed pieces. Warm afternoon light. Brass curtain rods with linen curtains. Books stacked on coffee table. Cultivated, literary, inviting. No skylights, no vertical slats. DINING ROOM SPECIFIC: If this is a dining room, apply the following: Warm contemporary dining room with traditional wainscoting panels at dado height, painted sage or forest green. Cream walls above. Solid oak or walnut dining table with natural grain, rectangular, seats 6-8. Cesca chairs in natural cane and chrome surrounding the table. Built-in sideboard or credenza in matching wood tones. Statement pendant light in brass or woven material above table. Gallery wall featuring Keith Haring prints prominently alongside gilt-framed landscapes and photography. Herringbone oak flooring. Brass candlesticks on table. Large ceramic vase with branches or greenery. Soft linen curtains. Editorial, collected, convivial. No skylights, no vertical slats.',
+})
+
+# Room Type descriptions (for furniture context only)
+ROOM_TYPE_FURNITURE = MappingProxyType({
+    'living': 'appropriate living room furniture like sofa, coffee table, ambient lighting',
+    'bedroom': 'appropriate bedroom furniture like bed, bedside tables, soft lighting',
+    'kitchen': 'appropriate kitchen elements like updated cabinets, countertops, modern appliances. Only add a kitchen island if there is sufficient space. If no space for an island, try a peninsula. If no space for either, keep as a galley or simple layout with no kitchen table. Prioritise cabinet layout, flow, and storage composition.',
+    'dining': 'appropriate dining furniture like table and chairs, statement lighting',
+    'bathroom': 'appropriate bathroom fixtures like updated vanity, modern taps, quality tiles',
+    'office': 'appropriate office furniture like desk, ergonomic chair, task lighting',
+    'hallway': 'MINIMAL hallway elements ONLY - possibly a console table if space genuinely allows, but NO other furniture whatsoever',
+    'garden': 'landscaped garden features',
+    'outdoor': 'outdoor furniture and landscaping elements',
+})
+
+# Time of day lighting descriptions - ONLY changes lighting, colors, and hues
+# DO NOT change physical elements or what's visible outside windows
+TIME_OF_DAY_PROMPTS = MappingProxyType({
+    'day': 'DAYLIGHT LIGHTING: Apply bright, natural daylight illumination throughout the interior. Use soft, even lighting with minimal shadows. If windows exist, apply cool natural daylight color temperature to the light coming through them - DO NOT change what is visible outside the windows, only adjust the color and brightness of the light itself. The interior should feel fresh, airy, and naturally lit with cool neutral tones.',
+
+    'night': 'NIGHT LIGHTING: Apply warm artificial interior lighting (ceiling lights, lamps, downlights) as the primary light source. If windows exist, darken the light coming through them to indicate nighttime - DO NOT change what is visible outside the windows, only adjust the darkness/brightness of the window areas to appear darker. Use warm amber lighting tones for interior fixtures. Create cozy evening ambiance with warm artificial light.',
+
+    'golden_hour': 'GOLDEN HOUR LIGHTING: Apply hard, directional golden light streaming into the room at a low angle through windows, creating defined shadows and warm golden pools on surfaces. Tinge the light coming through windows with warm golden-orange tones - DO NOT change what is visible outside the windows, only make the light itself appear golden as it enters the room. The light should have a strong directional quality, coming in at a low angle as if from late-afternoon sun, casting long shadows across floors and walls. Create dramatic contrast between the golden-lit areas and shadowed areas. The overall atmosphere should feel warm and bathed in golden light while maintaining natural realism.',
+})
+
+# Colour scheme palettes - Full ROYGBIV spectrum
+# CRITICAL: Only describe paint colors, NEVER mention "accent wall" or structural changes
+COLOUR_SCHEME_PROMPTS = MappingProxyType({
+    # Neutrals & Whites
+    'soft_linen': 'soft warm linen white color palette, clean calm atmosphere with subtle warmth',
+    'cream_core': 'rich cream color palette, warm inviting atmosphere',
+    'nordic_mist': 'pale grey-white color palette, Scandinavian bright minimalism',
+    'warm_grey': 'warm grey color palette with taupe undertones, cozy neutral sophistication',
+    'charcoal': 'deep charcoal grey color palette, dramatic moody elegance with warm lighting',
+
+    # Reds & Pinks
+    'burgundy_depth': 'deep burgundy color palette, luxurious moody tones with rich depth',
+    'crimson_red': 'bold crimson red color palette, vibrant statement color with neutral balance',
+    'blush_pink': 'soft blush pink color palette, romantic feminine warmth',
+    'dusty_rose': 'dusty rose color palette, muted pink with earthy sophistication',
+
+    # Oranges & Corals
+    'terracotta_sun': 'warm terracotta color palette, sun-baked Mediterranean warmth',
+    'burnt_orange': 'burnt orange color palette, bold autumnal richness',
+    'coral_reef': 'coral color palette, vibrant tropical warmth with energy',
+
+    # Yellows & Golds
+    'amber_glow': 'warm amber yellow color palette, vibrant golden energy',
+    'sunshine_yellow': 'bright sunshine yellow color palette, cheerful optimistic warmth',
+    'mustard': 'mustard yellow color palette, vintage warm sophistication',
+
+    # Greens
+    'sage_calm': 'soft sage green color palette, calming natural tones',
+    'olive_grove': 'olive green color palette, earthy natural sophistication',
+    'forest_green': 'dark forest green color palette, rich jewel tone with warm brass accents',
+    'emerald': 'emerald green color palette, luxurious jewel tone vibrancy',
+
+    # Blues
+    'midnight_blue': 'midnight blue color palette with warm brass or gold accents, deep sophisticated navy',
+    'sky_blue': 'sky blue color palette, fresh airy coastal lightness',
+    'teal': 'teal color palette, sophisticated blue-green balance with depth',
+    'navy': 'navy blue color palette, classic nautical depth with warm contrast',
+
+    # Purples & Violets
+    'lavender': 'soft lavender color palette, gentle purple with calming elegance',
+    'plum': 'rich plum purple color palette, luxurious jewel tone sophistication',
+    'aubergine': 'deep aubergine color palette, dramatic dark purple with moody warmth',
+})
+
+# Flooring descriptions
+FLOORING_PROMPTS = MappingProxyType({
+    'wood_parquet': 'wood parquet flooring in herringbone or chevron pattern',
+    'tiled': 'large format ceramic or porcelain tiles',
+    'stone_slabs': 'natural stone slab flooring',
+    'polished_concrete': 'polished concrete floors with subtle sheen',
+    'carpetted': 'high-quality carpeted flooring with plush texture',
+})
+
+# Wallpaper descriptions
+WALLPAPER_PROMPTS = MappingProxyType({
+    'floral': 'elegant floral wallpaper with delicate botanical pattern, sophisticated and refined',
+    'geometric': 'modern geometric wallpaper with clean lines and abstract patterns, contemporary style',
+    'striped': 'classic striped wallpaper with vertical lines, timeless and elegant',
+    'damask': 'traditional damask wallpaper with ornate repeating patterns, luxurious heritage style',
+    'botanical': 'lush botanical wallpaper with large-scale leaf and plant motifs, tropical sophistication',
+})
+
+# Garden style descriptions
+GARDEN_STYLE_PROMPTS = MappingProxyType({
+    'english_cottage': 'Transform into a romantic English Cottage Garden. Create billowing mixed borders filled with roses, lavender, foxgloves, and delphiniums in abundant layers. Add winding natural paths that curve gently through the space. Include climbing plants over arches or pergolas if space allows. Place a hidden bench or seating nook. The overall feel should be joyfully abundant, gently messy in the best way, with a "just discovered this secret garden" romantic atmosphere.',
+
+    'naturalistic_meadow': 'Transform into a calm Naturalistic Meadow Garden. Plant informal drifts of ornamental grasses (like Stipa, Molinia) mixed with perennial wildflowers (like Echinacea, Verbena, Achillea). Create sweeping naturalistic planting that feels seasonal and ever-changing. Add soft curving mown paths through taller grasses. Include a wildlife pond if space permits. The overall feel should be modern-wild, serene, and nature-led with movement and texture.',
+
+    'modern_contemporary': 'Transform into a clean Modern Contemporary Garden. Use sharp geometric lines and clear architectural forms throughout. Install large-format paving slabs or composite decking in neutral tones. Add raised rectangular planters with limited plant palette (architectural grasses like Miscanthus, or Japanese maples). Include a minimalist water feature (rill or reflecting pool). Add sleek outdoor lounge furniture. Install dramatic LED strip lighting for evening drama. The overall feel should be sculptural, confident, and sophisticatedly minimal.',
+
+    'japanese': 'Transform into a quietly spiritual Japanese Garden. Lay natural stone paths or stepping stones with careful placement. Plant clipped evergreen shrubs (pines, junipers, box) with precise sculptural pruning. Add low mossy ground cover and gravel areas raked in patterns. Include a reflecting pond or water bowl if space allows. Place a stone lantern as a focal point. Frame key views with careful plant placement to guide contemplation. The overall feel should be precise without stiffness, balanced asymmetrically, deeply calm and meditative.',
+
+    'mediterranean': 'Transform into a sun-bleached Mediterranean Garden. Plant olive trees or fig trees as structural anchors. Add lavender, rosemary, and other aromatic drought-tolerant herbs throughout. Use gravel as ground cover in warm terracotta tones. Place terracotta pots clustered in groups. Include low stone walls or rendered walls in warm ochre. Add a water bowl or simple fountain. Install a shaded dining pergola with climbing vines. The overall feel should be relaxed, permanently on holiday, sun-soaked and aromatic.',
+
+    'woodland': 'Transform into an enclosed atmospheric Woodland Garden. Preserve or enhance existing mature trees to create dappled shade canopy. Plant layered understory with ferns, hostas, and shade-loving perennials. Add meandering bark-mulch paths that curve naturally. Include natural moss-covered stone seating or log benches. Plant spring bulbs (bluebells, snowdrops) and hellebores for seasonal drama. Create pockets that feel like secret hideaways. The overall feel should be textural, enclosed, deeply atmospheric and mysteriously beautiful.',
+
+    'urban_courtyard': 'Transform into a sophisticated Urban Courtyard Garden. Maximize vertical space with wall-mounted planters and climbing plants on trellises. Create bold container cluster arrangements at multiple heights. Install sleek paving covering most of the floor, softened by strategic greenery. Add compact bistro furniture or a modern lounge chair. Use mirrors on walls to create depth illusion. Install clever uplighting and string lights for nighttime atmosphere. The overall feel should be small-space sophistication with attitude, layered and stylish.',
+
+    'wildlife_pollinator': 'Transform into a buzzing Wildlife/Pollinator Garden. Plant wildflower meadow sections with native species rich in nectar. Add mixed hedgerows with berries and seeds for birds. Include a wildlife pond with gentle sloping edges. Place log piles and insect hotels in corners. Plant seed-rich flowers (Rudbeckia, Sedum, Verbena). Leave some unmanicured edges and corners deliberately wild. The overall feel should be life-first, soulful, abundant with wildlife, trading rigid tidiness for living richness and biodiversity.',
+})
+
+if set(get_args(StyleName)) != STYLE_PROMPTS.keys():
+    raise RuntimeError("StyleName is out of sync with STYLE_PROMPTS")
+
+# Room types that get the outdoor (garden) prompt
+GARDEN_ROOM_TYPES = frozenset({'garden', 'outdoor'})
+
+# Non-negotiable editing rules for gardens and outdoor spaces
+GARDEN_RULES = (
+    "CRITICAL NON-NEGOTIABLE RULE - DOORS AND WINDOWS: If there are ANY doors or windows visible in this outdoor space, you MUST leave them EXACTLY where they are - same position, same size, same shape, same number. DO NOT move, resize, add, or remove ANY doors or windows. ABSOLUTELY NO NEW WINDOWS OR DOORS OF ANY KIND.",
+    "EDIT THE PROVIDED PHOTOGRAPH of this outdoor space. Do not create a new image - modify the existing photo only.",
+    "Keep the EXACT same garden boundaries, fences, walls, and structures in their current positions.",
+    "Keep the EXACT same camera angle and perspective as the input photo.",
+    "Repair and refinish any existing fences to look fresh and well-maintained.",
+    "Leave any large existing trees exactly where they are - preserve mature planting.",
+    "Renovate any existing garden sheds to look clean, painted, and well-kept.",
+)
+GARDEN_HEADER = " ".join(GARDEN_RULES)
+
+# Default fallback garden style if none specified
+GARDEN_DEFAULT_STYLE = " ".join((
+    "Transform this into a minimal, sophisticated English garden with restraint and elegance.",
+    "Add a pristine manicured lawn with healthy lush green grass.",
+    "PLANTING: Keep it minimal - ONLY white hydrangeas and subtle neatly-trimmed box hedging for structure.",
+    "NO colourful flowers, NO busy borders, NO grandma's garden aesthetic.",
+    "If space allows, add simple stepping stone garden path through the grass (natural stone or slate).",
+    "The garden should feel calm, understated, and refined - not overdone.",
+))
+
+# Rules shared word-for-word by the hallway and interior prompts
+RULE_CAMERA_PERSPECTIVE = "CRITICAL NON-NEGOTIABLE RULE #3 - CAMERA PERSPECTIVE: Keep the EXACT same camera angle, viewpoint, and perspective as the input photo. DO NOT change the viewing angle or create a different perspective."
+RULE_EDIT_PHOTO = "EDIT THE PROVIDED PHOTOGRAPH. Do not create a new image - modify the existing photo only."
+
+# Non-negotiable editing rules for hallways
+HALLWAY_RULES = (
+    "CRITICAL NON-NEGOTIABLE RULE #1 - EXACT ROOM DIMENSIONS: The hallway MUST remain the EXACT same size and shape. DO NOT enlarge, shrink, expand, or resize the hallway in any dimension. Keep all walls in their exact original positions. This hallway may be small or tight - that is COMPLETELY FINE and MUST be preserved exactly as is.",
+    "CRITICAL NON-NEGOTIABLE RULE #2 - DOORS AND WINDOWS: If there are ANY doors or windows in this hallway, you MUST leave them EXACTLY where they are - same position, same size, same shape, same number. DO NOT move, resize, add, or remove ANY doors or windows. ABSOLUTELY NO NEW WINDOWS OR DOORS OF ANY KIND.",
+    RULE_CAMERA_PERSPECTIVE,
+    "CRITICAL NON-NEGOTIABLE RULE #4 - NO FURNITURE: DO NOT add ANY furniture to this hallway except POSSIBLY a slim console table ONLY if there is genuinely sufficient space. NO chairs, NO benches, NO storage units, NO shoe racks. Keep the hallway open and uncluttered. When in doubt, add NO furniture at all.",
+    "CRITICAL NON-NEGOTIABLE RULE #5 - PRESERVE EXACT LAYOUT: Keep the exact layout, width, and flow of the hallway. If the hallway is narrow or tight, maintain that exact narrowness. DO NOT try to make it appear wider or more spacious.",
+    RULE_EDIT_PHOTO,
+    "ONLY CHANGE: paint colours, flooring material, wall lighting, and minimal decor like wall art or mirror.",
+    "DO NOT CHANGE: room size, room shape, wall positions, hallway width, ceiling height, windows, doors, camera perspective, or add furniture.",
+)
 
-    # Room Type descriptions (for furniture context only)
-    room_type_furniture = {
-        'living': 'appropriate living room furniture like sofa, coffee table, ambient lighting',
-        'bedroom': 'appropriate bedroom furniture like bed, bedside tables, soft lighting',
-        'kitchen': 'appropriate kitchen elements like updated cabinets, countertops, modern appliances. Only add a kitchen island if there is sufficient space. If no space for an island, try a peninsula. If no space for either, keep as a galley or simple layout with no kitchen table. Prioritise cabinet layout, flow, and storage composition.',
-        'dining': 'appropriate dining furniture like table and chairs, statement lighting',
-        'bathroom': 'appropriate bathroom fixtures like updated vanity, modern taps, quality tiles',
-        'office': 'appropriate office furniture like desk, ergonomic chair, task lighting',
-        'hallway': 'MINIMAL hallway elements ONLY - possibly a console table if space genuinely allows, but NO other furniture whatsoever',
-        'garden': 'landscaped garden features',
-        'outdoor': 'outdoor furniture and landscaping elements',
-    }
-    
-    # Time of day lighting descriptions - ONLY changes lighting, colors, and hues
-    # DO NOT change physical elements or what's visible outside windows
-    time_of_day_prompts = {
-        'day': 'DAYLIGHT LIGHTING: Apply bright, natural daylight illumination throughout the interior. Use soft, even lighting with minimal shadows. If windows exist, apply cool natural daylight color temperature to the light coming through them - DO NOT change what is visible outside the windows, only adjust the color and brightness of the light itself. The interior should feel fresh, airy, and naturally lit with cool neutral tones.',
+# Non-negotiable editing rules for standard interiors
+INTERIOR_RULES = (
+    "CRITICAL NON-NEGOTIABLE RULE #1 - EXACT ROOM DIMENSIONS: The room MUST remain the EXACT same size and shape. DO NOT enlarge, shrink, expand, or resize the room in any dimension. The room's width, length, height, and overall volume must be IDENTICAL to the original photo. Keep all walls in their exact original positions.",
+    "CRITICAL NON-NEGOTIABLE RULE #2 - DOORS AND WINDOWS: If there are ANY doors or windows in this room, you MUST leave them EXACTLY where they are - same position, same size, same shape, same number. DO NOT move, resize, add, or remove ANY doors or windows. This is ABSOLUTELY MANDATORY. NO NEW WINDOWS OR DOORS OF ANY KIND.",
+    RULE_CAMERA_PERSPECTIVE,
+    RULE_EDIT_PHOTO,
+    "ONLY CHANGE: paint colours, flooring material, furniture, fixtures, and decor.",
+    "DO NOT CHANGE: room size, room shape, wall positions, ceiling height, windows, doors, or camera perspective.",
+)
 
-        'night': 'NIGHT LIGHTING: Apply warm artificial interior lighting (ceiling lights, lamps, downlights) as the primary light source. If windows exist, darken the light coming through them to indicate nighttime - DO NOT change what is visible outside the windows, only adjust the darkness/brightness of the window areas to appear darker. Use warm amber lighting tones for interior fixtures. Create cozy evening ambiance with warm artificial light.',
+# Rules + "Apply <style>." joined once per style, so only the per-request
+# toggles are assembled at call time
+HALLWAY_HEADERS = MappingProxyType({
+    style: " ".join((*HALLWAY_RULES, f"Apply {description}."))
+    for style, description in STYLE_PROMPTS.items()
+})
+HALLWAY_HEADER_DEFAULT = " ".join(HALLWAY_RULES)
 
-        'golden_hour': 'GOLDEN HOUR LIGHTING: Apply hard, directional golden light streaming into the room at a low angle through windows, creating defined shadows and warm golden pools on surfaces. Tinge the light coming through windows with warm golden-orange tones - DO NOT change what is visible outside the windows, only make the light itself appear golden as it enters the room. The light should have a strong directional quality, coming in at a low angle as if from late-afternoon sun, casting long shadows across floors and walls. Create dramatic contrast between the golden-lit areas and shadowed areas. The overall atmosphere should feel warm and bathed in golden light while maintaining natural realism.',
-    }
+INTERIOR_HEADERS = MappingProxyType({
+    style: " ".join((*INTERIOR_RULES, f"Apply {description}."))
+    for style, description in STYLE_PROMPTS.items()
+})
+INTERIOR_HEADER_DEFAULT = " ".join(INTERIOR_RULES)
 
-    # Colour scheme palettes - Full ROYGBIV spectrum
-    # CRITICAL: Only describe paint colors, NEVER mention "accent wall" or structural changes
-    colour_scheme_prompts = {
-        # Neutrals & Whites
-        'soft_linen': 'soft warm linen white color palette, clean calm atmosphere with subtle warmth',
-        'cream_core': 'rich cream color palette, warm inviting atmosphere',
-        'nordic_mist': 'pale grey-white color palette, Scandinavian bright minimalism',
-        'warm_grey': 'warm grey color palette with taupe undertones, cozy neutral sophistication',
-        'charcoal': 'deep charcoal grey color palette, dramatic moody elegance with warm lighting',
-
-        # Reds & Pinks
-        'burgundy_depth': 'deep burgundy color palette, luxurious moody tones with rich depth',
-        'crimson_red': 'bold crimson red color palette, vibrant statement color with neutral balance',
-        'blush_pink': 'soft blush pink color palette, romantic feminine warmth',
-        'dusty_rose': 'dusty rose color palette, muted pink with earthy sophistication',
-
-        # Oranges & Corals
-        'terracotta_sun': 'warm terracotta color palette, sun-baked Mediterranean warmth',
-        'burnt_orange': 'burnt orange color palette, bold autumnal richness',
-        'coral_reef': 'coral color palette, vibrant tropical warmth with energy',
-
-        # Yellows & Golds
-        'amber_glow': 'warm amber yellow color palette, vibrant golden energy',
-        'sunshine_yellow': 'bright sunshine yellow color palette, cheerful optimistic warmth',
-        'mustard': 'mustard yellow color palette, vintage warm sophistication',
-
-        # Greens
-        'sage_calm': 'soft sage green color palette, calming natural tones',
-        'olive_grove': 'olive green color palette, earthy natural sophistication',
-        'forest_green': 'dark forest green color palette, rich jewel tone with warm brass accents',
-        'emerald': 'emerald green color palette, luxurious jewel tone vibrancy',
-
-        # Blues
-        'midnight_blue': 'midnight blue color palette with warm brass or gold accents, deep sophisticated navy',
-        'sky_blue': 'sky blue color palette, fresh airy coastal lightness',
-        'teal': 'teal color palette, sophisticated blue-green balance with depth',
-        'navy': 'navy blue color palette, classic nautical depth with warm contrast',
-
-        # Purples & Violets
-        'lavender': 'soft lavender color palette, gentle purple with calming elegance',
-        'plum': 'rich plum purple color palette, luxurious jewel tone sophistication',
-        'aubergine': 'deep aubergine color palette, dramatic dark purple with moody warmth',
-    }
+# Toggle descriptions pre-formatted into the sentences the prompt uses
+FURNITURE_SENTENCES = MappingProxyType({k: f"Use {v}." for k, v in ROOM_TYPE_FURNITURE.items()})
+LIGHTING_SENTENCES = MappingProxyType({k: f"Lighting: {v}." for k, v in TIME_OF_DAY_PROMPTS.items()})
+COLOUR_SENTENCES = MappingProxyType({k: f"Colours: {v}." for k, v in COLOUR_SCHEME_PROMPTS.items()})
+FLOORING_SENTENCES = MappingProxyType({k: f"Flooring: {v}." for k, v in FLOORING_PROMPTS.items()})
+WALLPAPER_SENTENCES = MappingProxyType({k: f"Wall treatment: {v}." for k, v in WALLPAPER_PROMPTS.items()})
 
-    # Flooring descriptions
-    flooring_prompts = {
-        'wood_parquet': 'wood parquet flooring in herringbone or chevron pattern',
-        'tiled': 'large format ceramic or porcelain tiles',
-        'stone_slabs': 'natural stone slab flooring',
-        'polished_concrete': 'polished concrete floors with subtle sheen',
-        'carpetted': 'high-quality carpeted flooring with plush texture',
-    }
 
-    # Wallpaper descriptions
-    wallpaper_prompts = {
-        'floral': 'elegant floral wallpaper with delicate botanical pattern, sophisticated and refined',
-        'geometric': 'modern geometric wallpaper with clean lines and abstract patterns, contemporary style',
-        'striped': 'classic striped wallpaper with vertical lines, timeless and elegant',
-        'damask': 'traditional damask wallpaper with ornate repeating patterns, luxurious heritage style',
-        'botanical': 'lush botanical wallpaper with large-scale leaf and plant motifs, tropical sophistication',
-    }
+def build_renovation_prompt(request: RenovationRequest) -> str:
+    """Build an optimised prompt for image EDITING (not generation) with style and configuration toggles."""
+    # Unknown toggle values render exactly like unset ones, so fold them to None -
+    # free-form junk then shares one cache entry instead of churning the prompt caches
+    room_type = request.room_type
+    time_of_day = request.time_of_day
+    colour_scheme = request.colour_scheme
+    flooring = request.flooring
+    wallpaper = request.wallpaper
+    garden_style = request.garden_style
+    toggles = (
+        request.style,
+        room_type if room_type in ROOM_TYPE_FURNITURE else None,
+        time_of_day if time_of_day in LIGHTING_SENTENCES else None,
+        colour_scheme if colour_scheme in COLOUR_SENTENCES else None,
+        flooring if flooring in FLOORING_SENTENCES else None,
+        wallpaper if wallpaper in WALLPAPER_SENTENCES else None,
+        garden_style if garden_style in GARDEN_STYLE_PROMPTS else None,
+    )
+
+    extra_notes = request.extra_notes
+
+    # Fast path: most requests have no notes, so the finished prompt comes straight from cache
+    if not extra_notes:
+        return _full_prompt(*toggles)
+
+    # Free-text notes go between the toggles and the closing reminder
+    body, closing = _prompt_sections(*toggles)
+    return f"{body} Also: {extra_notes} {closing}"
+
+
+@lru_cache(maxsize=PROMPT_CACHE_SIZE)
+def _full_prompt(*toggles: Optional[str]) -> str:
+    """The complete prompt for a configuration without extra notes."""
+    body, closing = _prompt_sections(*toggles)
+    return f"{body} {closing}"
+
+
+# Cached on the toggle values only - free-text notes are spliced in per call,
+# so the cache stays small and repeated configurations skip assembly entirely
+@lru_cache(maxsize=PROMPT_CACHE_SIZE)
+def _prompt_sections(
+    style: Optional[str],
+    room_type: Optional[str],
+    time_of_day: Optional[str],
+    colour_scheme: Optional[str],
+    flooring: Optional[str],
+    wallpaper: Optional[str],
+    garden_style: Optional[str],
+) -> tuple[str, str]:
+    """Build the prompt either side of the extra-notes slot, as (body, closing)."""
 
-    # Garden style descriptions
-    garden_style_prompts = {
-        'english_cottage': 'Transform into a romantic English Cottage Garden. Create billowing mixed borders filled with roses, lavender, foxgloves, and delphiniums in abundant layers. Add winding natural paths that curve gently through the space. Include climbing plants over arches or pergolas if space allows. Place a hidden bench or seating nook. The overall feel should be joyfully abundant, gently messy in the best way, with a "just discovered this secret garden" romantic atmosphere.',
+    # Build the prompt - FOCUS ON EDITING, NOT GENERATING
 
-        'naturalistic_meadow': 'Transform into a calm Naturalistic Meadow Garden. Plant informal drifts of ornamental grasses (like Stipa, Molinia) mixed with perennial wildflowers (like Echinacea, Verbena, Achillea). Create sweeping naturalistic planting that feels seasonal and ever-changing. Add soft curving mown paths through taller grasses. Include a wildlife pond if space permits. The overall feel should be modern-wild, serene, and nature-led with movement and texture.',
+    # Special handling for garden/outdoor spaces
+    if room_type in GARDEN_ROOM_TYPES:
+        # Rules are pre-joined at import - only the garden style varies
+        garden_description = GARDEN_STYLE_PROMPTS.get(garden_style, GARDEN_DEFAULT_STYLE)
+        return f"{GARDEN_HEADER} {garden_description}", "Photorealistic result, professional landscape photography quality, natural daylight."
 
-        'modern_contemporary': 'Transform into a clean Modern Contemporary Garden. Use sharp geometric lines and clear architectural forms throughout. Install large-format paving slabs or composite decking in neutral tones. Add raised rectangular planters with limited plant palette (architectural grasses like Miscanthus, or Japanese maples). Include a minimalist water feature (rill or reflecting pool). Add sleek outdoor lounge furniture. Install dramatic LED strip lighting for evening drama. The overall feel should be sculptural, confident, and sophisticatedly minimal.',
+    # Special handling for hallways
+    if room_type == 'hallway':
+        # Rules + style sentence are pre-joined per style at import; no furniture sentence
+        toggle_sentences = (
+            LIGHTING_SENTENCES.get(time_of_day),
+            COLOUR_SENTENCES.get(colour_scheme),
+            FLOORING_SENTENCES.get(flooring),
+            WALLPAPER_SENTENCES.get(wallpaper),
+        )
+        prompt_parts = [HALLWAY_HEADERS.get(style, HALLWAY_HEADER_DEFAULT), *filter(None, toggle_sentences)]
 
-        'japanese': 'Transform into a quietly spiritual Japanese Garden. Lay natural stone paths or stepping stones with careful placement. Plant clipped evergreen shrubs (pines, junipers, box) with precise sculptural pruning. Add low mossy ground cover and gravel areas raked in patterns. Include a reflecting pond or water bowl if space allows. Place a stone lantern as a focal point. Frame key views with careful plant placement to guide contemplation. The overall feel should be precise without stiffness, balanced asymmetrically, deeply calm and meditative.',
+        # Final quality reminder
+        return " ".join(prompt_parts), "Photorealistic result, professional interior photography quality. Remember: NO furniture except possibly a slim console table if space genuinely allows."
 
-        'mediterranean': 'Transform into a sun-bleached Mediterranean Garden. Plant olive trees or fig trees as structural anchors. Add lavender, rosemary, and other aromatic drought-tolerant herbs throughout. Use gravel as ground cover in warm terracotta tones. Place terracotta pots clustered in groups. Include low stone walls or rendered walls in warm ochre. Add a water bowl or simple fountain. Install a shaded dining pergola with climbing vines. The overall feel should be relaxed, permanently on holiday, sun-soaked and aromatic.',
+    # Standard interior renovation prompt
+    # Rules + style sentence are pre-joined per style at import
+    toggle_sentences = (
+        FURNITURE_SENTENCES.get(room_type),
+        LIGHTING_SENTENCES.get(time_of_day),
+        COLOUR_SENTENCES.get(colour_scheme),
+        FLOORING_SENTENCES.get(flooring),
+        WALLPAPER_SENTENCES.get(wallpaper),
+    )
+    prompt_parts = [INTERIOR_HEADERS.get(style, INTERIOR_HEADER_DEFAULT), *filter(None, toggle_sentences)]
 
-        'woodland': 'Transform into an enclosed atmospheric Woodland Garden. Preserve or enhance existing mature trees to create dappled shade canopy. Plant layered understory with ferns, hostas, and shade-loving perennials. Add meandering bark-mulch paths that curve naturally. Include natural moss-covered stone seating or log benches. Plant spring bulbs (bluebells, snowdrops) and hellebores for seasonal drama. Create pockets that feel like secret hideaways. The overall feel should be textural, enclosed, deeply atmospheric and mysteriously beautiful.',
+    # Always include greenery for realism and warmth
+    prompt_parts.append("Include tasteful placement of indoor plants and flowers to enhance realism and warmth.")
 
-        'urban_courtyard': 'Transform into a sophisticated Urban Courtyard Garden. Maximize vertical space with wall-mounted planters and climbing plants on trellises. Create bold container cluster arrangements at multiple heights. Install sleek paving covering most of the floor, softened by strategic greenery. Add compact bistro furniture or a modern lounge chair. Use mirrors on walls to create depth illusion. Install clever uplighting and string lights for nighttime atmosphere. The overall feel should be small-space sophistication with attitude, layered and stylish.',
+    # Final quality reminder
+    return " ".join(prompt_parts), "Photorealistic result, professional interior photography quality."
 
-        'wildlife_pollinator': 'Transform into a buzzing Wildlife/Pollinator Garden. Plant wildflower meadow sections with native species rich in nectar. Add mixed hedgerows with berries and seeds for birds. Include a wildlife pond with gentle sloping edges. Place log piles and insect hotels in corners. Plant seed-rich flowers (Rudbeckia, Sedum, Verbena). Leave some unmanicured edges and corners deliberately wild. The overall feel should be life-first, soulful, abundant with wildlife, trading rigid tidiness for living richness and biodiversity.',
-    }
-    
-    # Build the prompt - FOCUS ON EDITING, NOT GENERATING
-    
-    # Special handling for garden/outdoor spaces
-    if request.room_type in ['garden', 'outdoor']:
-        prompt_parts = [
-            "CRITICAL NON-NEGOTIABLE RULE - DOORS AND WINDOWS: If there are ANY doors or windows visible in this outdoor space, you MUST leave them EXACTLY where they are - same position, same size, same shape, same number. DO NOT move, resize, add, or remove ANY doors or windows. ABSOLUTELY NO NEW WINDOWS OR DOORS OF ANY KIND.",
-            "EDIT THE PROVIDED PHOTOGRAPH of this outdoor space. Do not create a new image - modify the existing photo only.",
-            "Keep the EXACT same garden boundaries, fences, walls, and structures in their current positions.",
-            "Keep the EXACT same camera angle and perspective as the input photo.",
-            "Repair and refinish any existing fences to look fresh and well-maintained.",
-            "Leave any large existing trees exactly where they are - preserve mature planting.",
-            "Renovate any existing garden sheds to look clean, painted, and well-kept.",
-        ]
 
-        # Apply garden style if specified
-        if request.garden_style and request.garden_style in garden_style_prompts:
-            prompt_parts.append(garden_style_prompts[request.garden_style])
-        else:
-            # Default fallback garden style if none specified
-            prompt_parts.extend([
-                "Transform this into a minimal, sophisticated English garden with restraint and elegance.",
-                "Add a pristine manicured lawn with healthy lush green grass.",
-                "PLANTING: Keep it minimal - ONLY white hydrangeas and subtle neatly-trimmed box hedging for structure.",
-                "NO colourful flowers, NO busy borders, NO grandma's garden aesthetic.",
-                "If space allows, add simple stepping stone garden path through the grass (natural stone or slate).",
-                "The garden should feel calm, understated, and refined - not overdone.",
-            ])
+# Processed (resized, JPEG-encoded) source images keyed by URL (or upload digest), least recently used first.
+# Users regenerate the same room in several styles, so skip the download and re-encode.
+_source_image_cache: OrderedDict[str, str] = OrderedDict()
+_source_image_cache_bytes = 0
 
-        # Add extra notes if provided
-        if request.extra_notes:
-            prompt_parts.append(f"Also: {request.extra_notes}")
+# In-flight source image fetches keyed by URL - several style variations of the
+# same room rendered at once share one download and re-encode
+_inflight_image_fetches: dict[str, asyncio.Task] = {}
 
-        prompt_parts.append("Photorealistic result, professional landscape photography quality, natural daylight.")
+def _get_cached_source_image(url: str) -> Optional[str]:
+    """Return a processed source image from cache, marking it recently used."""
+    image_b64 = _source_image_cache.get(url)
+    if image_b64 is not None:
+        _source_image_cache.move_to_end(url)
+    return image_b64
 
-        return " ".join(prompt_parts)
 
-    # Special handling for hallways
-    if request.room_type == 'hallway':
-        prompt_parts = [
-            "CRITICAL NON-NEGOTIABLE RULE #1 - EXACT ROOM DIMENSIONS: The hallway MUST remain the EXACT same size and shape. DO NOT enlarge, shrink, expand, or resize the hallway in any dimension. Keep all walls in their exact original positions. This hallway may be small or tight - that is COMPLETELY FINE and MUST be preserved exactly as is.",
-            "CRITICAL NON-NEGOTIABLE RULE #2 - DOORS AND WINDOWS: If there are ANY doors or windows in this hallway, you MUST leave them EXACTLY where they are - same position, same size, same shape, same number. DO NOT move, resize, add, or remove ANY doors or windows. ABSOLUTELY NO NEW WINDOWS OR DOORS OF ANY KIND.",
-            "CRITICAL NON-NEGOTIABLE RULE #3 - CAMERA PERSPECTIVE: Keep the EXACT same camera angle, viewpoint, and perspective as the input photo. DO NOT change the viewing angle or create a different perspective.",
-            "CRITICAL NON-NEGOTIABLE RULE #4 - NO FURNITURE: DO NOT add ANY furniture to this hallway except POSSIBLY a slim console table ONLY if there is genuinely sufficient space. NO chairs, NO benches, NO storage units, NO shoe racks. Keep the hallway open and uncluttered. When in doubt, add NO furniture at all.",
-            "CRITICAL NON-NEGOTIABLE RULE #5 - PRESERVE EXACT LAYOUT: Keep the exact layout, width, and flow of the hallway. If the hallway is narrow or tight, maintain that exact narrowness. DO NOT try to make it appear wider or more spacious.",
-            "EDIT THE PROVIDED PHOTOGRAPH. Do not create a new image - modify the existing photo only.",
-            "ONLY CHANGE: paint colours, flooring material, wall lighting, and minimal decor like wall art or mirror.",
-            "DO NOT CHANGE: room size, room shape, wall positions, hallway width, ceiling height, windows, doors, camera perspective, or add furniture.",
-        ]
+def _cache_source_image(url: str, image_b64: str) -> None:
+    """Cache a processed source image, evicting least recently used entries over budget."""
+    global _source_image_cache_bytes
 
-        # Style
-        if request.style and request.style in style_prompts:
-            prompt_parts.append(f"Apply {style_prompts[request.style]}.")
+    if len(image_b64) > SOURCE_IMAGE_CACHE_BYTES:
+        return
 
-        # Add time of day if specified
-        if request.time_of_day and request.time_of_day in time_of_day_prompts:
-            prompt_parts.append(f"Lighting: {time_of_day_prompts[request.time_of_day]}.")
+    previous = _source_image_cache.pop(url, None)
+    if previous is not None:
+        _source_image_cache_bytes -= len(previous)
 
-        # Add colour scheme if specified
-        if request.colour_scheme and request.colour_scheme in colour_scheme_prompts:
-            prompt_parts.append(f"Colours: {colour_scheme_prompts[request.colour_scheme]}.")
+    _source_image_cache[url] = image_b64
+    _source_image_cache_bytes += len(image_b64)
 
-        # Add flooring if specified
-        if request.flooring and request.flooring in flooring_prompts:
-            prompt_parts.append(f"Flooring: {flooring_prompts[request.flooring]}.")
+    while _source_image_cache_bytes > SOURCE_IMAGE_CACHE_BYTES:
+        _, evicted = _source_image_cache.popitem(last=False)
+        _source_image_cache_bytes -= len(evicted)
 
-        # Add wallpaper if specified
-        if request.wallpaper and request.wallpaper in wallpaper_prompts:
-            prompt_parts.append(f"Wall treatment: {wallpaper_prompts[request.wallpaper]}.")
 
-        # Add extra notes if provided
-        if request.extra_notes:
-            prompt_parts.append(f"Also: {request.extra_notes}")
+# Normalised image URLs must be http(s); anything else (spaces included) is left to
+# httpx, which percent-encodes it like it always has
+IMAGE_URL_SCHEMES = ('http://', 'https://')
 
-        # Final quality reminder
-        prompt_parts.append("Photorealistic result, professional interior photography quality. Remember: NO furniture except possibly a slim console table if space genuinely allows.")
 
-        return " ".join(prompt_parts)
+async def read_image_body(response: httpx.Response, too_large_detail: str = "Image is too large") -> bytearray:
+    """
+    Read a streamed image response in chunks, capped at MAX_SOURCE_IMAGE_BYTES.
+    Rejects on Content-Length up front, and on the running total for chunked responses.
+    """
+    content_length = response.headers.get("content-length")
+    if content_length and content_length.isdigit() and int(content_length) > MAX_SOURCE_IMAGE_BYTES:
+        raise HTTPException(status_code=400, detail=too_large_detail)
 
-    # Standard interior renovation prompt
-    prompt_parts = [
-        "CRITICAL NON-NEGOTIABLE RULE #1 - EXACT ROOM DIMENSIONS: The room MUST remain the EXACT same size and shape. DO NOT enlarge, shrink, expand, or resize the room in any dimension. The room's width, length, height, and overall volume must be IDENTICAL to the original photo. Keep all walls in their exact original positions.",
-        "CRITICAL NON-NEGOTIABLE RULE #2 - DOORS AND WINDOWS: If there are ANY doors or windows in this room, you MUST leave them EXACTLY where they are - same position, same size, same shape, same number. DO NOT move, resize, add, or remove ANY doors or windows. This is ABSOLUTELY MANDATORY. NO NEW WINDOWS OR DOORS OF ANY KIND.",
-        "CRITICAL NON-NEGOTIABLE RULE #3 - CAMERA PERSPECTIVE: Keep the EXACT same camera angle, viewpoint, and perspective as the input photo. DO NOT change the viewing angle or create a different perspective.",
-        "EDIT THE PROVIDED PHOTOGRAPH. Do not create a new image - modify the existing photo only.",
-        "ONLY CHANGE: paint colours, flooring material, furniture, fixtures, and decor.",
-        "DO NOT CHANGE: room size, room shape, wall positions, ceiling height, windows, doors, or camera perspective.",
-    ]
-    
-    # Style
-    if request.style and request.style in style_prompts:
-        prompt_parts.append(f"Apply {style_prompts[request.style]}.")
-    
-    # Room-appropriate furniture
-    if request.room_type and request.room_type in room_type_furniture:
-        prompt_parts.append(f"Use {room_type_furniture[request.room_type]}.")
-    
-    # Add time of day if specified
-    if request.time_of_day and request.time_of_day in time_of_day_prompts:
-        prompt_parts.append(f"Lighting: {time_of_day_prompts[request.time_of_day]}.")
-    
-    # Add colour scheme if specified
-    if request.colour_scheme and request.colour_scheme in colour_scheme_prompts:
-        prompt_parts.append(f"Colours: {colour_scheme_prompts[request.colour_scheme]}.")
-    
-    # Add flooring if specified
-    if request.flooring and request.flooring in flooring_prompts:
-        prompt_parts.append(f"Flooring: {flooring_prompts[request.flooring]}.")
-
-    # Add wallpaper if specified
-    if request.wallpaper and request.wallpaper in wallpaper_prompts:
-        prompt_parts.append(f"Wall treatment: {wallpaper_prompts[request.wallpaper]}.")
+    body = bytearray()
+    async for chunk in response.aiter_bytes(65536):
+        body.extend(chunk)
+        if len(body) > MAX_SOURCE_IMAGE_BYTES:
+            raise HTTPException(status_code=400, detail=too_large_detail)
+    return body
 
-    # Always include greenery for realism and warmth
-    prompt_parts.append("Include tasteful placement of indoor plants and flowers to enhance realism and warmth.")
 
-    # Add extra notes if provided
-    if request.extra_notes:
-        prompt_parts.append(f"Also: {request.extra_notes}")
+# Re-encoding drops EXIF, so rotated photos must go through Pillow to keep the orientation they had before
+EXIF_ORIENTATION_TAG = 0x0112
 
-    # Final quality reminder
-    prompt_parts.append("Photorealistic result, professional interior photography quality.")
 
-    return " ".join(prompt_parts)
+def encode_source_image(img: Image.Image, image_bytes: bytes) -> str:
+    """
+    Prepare an opened source image for the model: downscale, drop alpha, re-encode as base64 JPEG.
+    Shared by uploaded and fetched images so there is one codec path to tune.
+    """
+    max_size = 2048
+
+    # Already a model-ready JPEG (the usual Rightmove photo) - send the original bytes
+    # as-is rather than paying for a decode and re-encode. Image.open only read the header.
+    if (
+        img.format == 'JPEG'
+        and img.mode == 'RGB'
+        and max(img.size) <= max_size
+        and img.getexif().get(EXIF_ORIENTATION_TAG, 1) == 1
+    ):
+        return pybase64.b64encode(image_bytes).decode('utf-8')
+
+    # Resize if larger than 2048 on any side (Gemini's recommended max)
+    if max(img.size) > max_size:
+        ratio = max_size / max(img.size)
+        new_size = tuple(int(dim * ratio) for dim in img.size)
+
+        # Let libjpeg decode at 1/2, 1/4 or 1/8 scale when that still covers the target,
+        # so huge photos never get fully decoded (no-op for non-JPEG images)
+        img.draft(None, new_size)
+        # Box-reduce first on very large downscales (non-JPEG sources that draft can't shrink)
+        img = img.resize(new_size, Image.LANCZOS, reducing_gap=3.0)
+
+    # Convert to RGB if necessary (remove alpha channel)
+    if img.mode in ('RGBA', 'LA', 'P'):
+        img = img.convert('RGB')
+
+    # Save to bytes - closing the buffer frees the encoded copy as soon as it's base64'd
+    with BytesIO() as buffer:
+        img.save(buffer, format='JPEG', quality=SOURCE_JPEG_QUALITY)
+        return pybase64.b64encode(buffer.getvalue()).decode('utf-8')
 
 
 async def fetch_image_as_base64(url: str) -> str:
     """Fetch an image from URL and return as base64."""
 
     # Validate URL is not empty
-    if not url or not url.strip():
+    if not url or url.isspace():
         raise HTTPException(status_code=400, detail="Image URL cannot be empty")
 
     # Check if this is a data URI (uploaded image)
     if url.startswith('data:image'):
+        # Key uploads by digest - re-rendering an upload in another style resends the same multi-MB URI
+        cache_key = "upload:" + hashlib.blake2b(url.encode(), digest_size=16).hexdigest()
+        cached = _get_cached_source_image(cache_key)
+        if cached is not None:
+            print(f"[DEBUG] Using cached uploaded image ({cache_key})")
+            return cached
+
         print(f"[DEBUG] Processing uploaded image (data URI)")
         try:
             # Extract the base64 data from the data URI
             # Format: data:image/jpeg;base64,<base64-data>
-            header, base64_data = url.split(',', 1)
+            # Only search the short header for the comma, not the multi-MB payload
+            comma = url.find(',', 0, 64)
+            if comma == -1:
+                raise ValueError("malformed data URI")
 
             # Decode the base64 data to validate it's a real image
-            image_bytes = base64.b64decode(base64_data)
+            image_bytes = pybase64.b64decode(url[comma + 1:])
 
             # Open with PIL to validate and potentially resize
             img = Image.open(BytesIO(image_bytes))
 
-            # Resize if larger than 2048 on any side (Gemini's recommended max)
-            max_size = 2048
-            if max(img.size) > max_size:
-                ratio = max_size / max(img.size)
-                new_size = tuple(int(dim * ratio) for dim in img.size)
-                img = img.resize(new_size, Image.LANCZOS)
-
-            # Convert to RGB if necessary (remove alpha channel)
-            if img.mode in ('RGBA', 'LA', 'P'):
-                img = img.convert('RGB')
-
-            # Save to bytes
-            buffer = BytesIO()
-            img.save(buffer, format='JPEG', quality=90)
-            return base64.b64encode(buffer.getvalue()).decode('utf-8')
+            # Pillow releases the GIL while decoding/resizing/encoding, so run it off the event loop
+            image_b64 = await asyncio.to_thread(encode_source_image, img, image_bytes)
+            _cache_source_image(cache_key, image_b64)
+            return image_b64
 
         except Exception as e:
             print(f"[ERROR] Failed to process uploaded image: {e}")
-            raise HTTPException(status_code=400, detail=f"Invalid image data: {str(e)}")
+            raise HTTPException(status_code=400, detail=f"Invalid image data: {e}")
 
     # Clean up the URL - remove any double encoding issues
     import urllib.parse
@@ -594,50 +1143,58 @@ async def fetch_image_as_base64(url: str) -> str:
     if not url.startswith('http'):
         url = 'https:' + url if url.startswith('//') else 'https://' + url
 
-    print(f"[DEBUG] Fetching image from: {url}")
+    if not url.startswith(IMAGE_URL_SCHEMES):
+        raise HTTPException(status_code=400, detail="Invalid image URL")
 
-    # Headers to look like a real browser - needed for Rightmove images
-    headers = {
-        "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-        "Accept": "image/avif,image/webp,image/apng,image/svg+xml,image/*,*/*;q=0.8",
-        "Accept-Language": "en-GB,en;q=0.9",
-        "Referer": "https://www.rightmove.co.uk/",
-    }
+    cached = _get_cached_source_image(url)
+    if cached is not None:
+        print(f"[DEBUG] Using cached source image for: {url}")
+        return cached
+
+    task = _inflight_image_fetches.get(url)
+    if task is None:
+        task = asyncio.create_task(_download_source_image(url))
+        _inflight_image_fetches[url] = task
+        task.add_done_callback(lambda _: _inflight_image_fetches.pop(url, None))
+    else:
+        print(f"[DEBUG] Joining in-flight fetch for: {url}")
+
+    # Shield so one caller disconnecting doesn't cancel the fetch for the others
+    return await asyncio.shield(task)
 
-    async with httpx.AsyncClient(timeout=30.0) as client:
+
+async def _download_source_image(url: str) -> str:
+    """Download, resize and JPEG-encode a source image, caching the result."""
+    print(f"[DEBUG] Fetching image from: {url}")
+
+    # Reuse the pooled app client so repeat fetches from the Rightmove media CDN skip the handshake
+    async with pooled_http_client() as client:
         try:
-            response = await client.get(url, headers=headers, follow_redirects=True)
-            print(f"[DEBUG] Response status: {response.status_code}, URL: {response.url}")
+            # Stream the download so oversized images are rejected without buffering them whole
+            async with client.stream("GET", url, headers=IMAGE_REQUEST_HEADERS, follow_redirects=True) as response:
+                print(f"[DEBUG] Response status: {response.status_code}, URL: {response.url}")
 
-            if response.status_code != 200:
-                raise HTTPException(status_code=400, detail=f"Failed to fetch source image: HTTP {response.status_code}")
+                if response.status_code != 200:
+                    raise HTTPException(status_code=400, detail=f"Failed to fetch source image: HTTP {response.status_code}")
+
+                image_data = await read_image_body(response, too_large_detail="Source image is too large")
 
             # Validate we received image content
-            if not response.content or len(response.content) == 0:
+            if not image_data:
                 raise HTTPException(status_code=400, detail="Received empty image data from URL")
 
             # Try to open as image
             try:
-                img = Image.open(BytesIO(response.content))
+                img = Image.open(BytesIO(image_data))
             except Exception as e:
                 print(f"[ERROR] Invalid image data: {e}")
                 raise HTTPException(status_code=400, detail="URL did not return a valid image file")
 
-            # Resize if larger than 2048 on any side (Gemini's recommended max)
-            max_size = 2048
-            if max(img.size) > max_size:
-                ratio = max_size / max(img.size)
-                new_size = tuple(int(dim * ratio) for dim in img.size)
-                img = img.resize(new_size, Image.LANCZOS)
-
-            # Convert to RGB if necessary (remove alpha channel)
-            if img.mode in ('RGBA', 'LA', 'P'):
-                img = img.convert('RGB')
+            # Pillow releases the GIL while decoding/resizing/encoding, so run it off the event loop
+            image_b64 = await asyncio.to_thread(encode_source_image, img, image_data)
 
-            # Save to bytes
-            buffer = BytesIO()
-            img.save(buffer, format='JPEG', quality=90)
-            return base64.b64encode(buffer.getvalue()).decode('utf-8')
+            _cache_source_image(url, image_b64)
+            return image_b64
 
         except HTTPException:
             raise
@@ -646,9 +1203,8 @@ async def fetch_image_as_base64(url: str) -> str:
             raise HTTPException(status_code=400, detail=f"Network error: Unable to fetch image from URL")
         except Exception as e:
             print(f"[ERROR] Unexpected error in fetch_image_as_base64: {e}")
-            import traceback
             traceback.print_exc()
-            raise HTTPException(status_code=500, detail=f"Failed to process image: {str(e)}")
+            raise HTTPException(status_code=500, detail=f"Failed to process image: {e}")
 
 
 async def generate_with_replicate(source_image_b64: str, prompt: str) -> str:
@@ -673,13 +1229,15 @@ async def generate_with_replicate(source_image_b64: str, prompt: str) -> str:
     # Convert our base64 source image to a temporary data URL
     image_data_url = f"data:image/jpeg;base64,{source_image_b64}"
 
-    async with httpx.AsyncClient(timeout=300.0) as client:
+    async with pooled_http_client() as client:
         try:
             # Create prediction
             response = await client.post(
                 "https://api.replicate.com/v1/predictions",
                 headers=headers,
-                json={
+                timeout=REPLICATE_TIMEOUT,
+                # orjson rather than httpx's stdlib json= encoder - the body carries the whole source image
+                content=orjson.dumps({
                     "version": "google/nano-banana",
                     "input": {
                         "prompt": prompt,
@@ -689,7 +1247,7 @@ async def generate_with_replicate(source_image_b64: str, prompt: str) -> str:
                         "aspect_ratio": "match_input_image",
                         "output_format": "jpg"
                     }
-                }
+                })
             )
 
             if response.status_code != 201:
@@ -706,7 +1264,7 @@ async def generate_with_replicate(source_image_b64: str, prompt: str) -> str:
                     detail=error_detail
                 )
 
-            prediction = response.json()
+            prediction = orjson.loads(response.content)
 
             # Validate prediction response structure
             if "urls" not in prediction or "get" not in prediction["urls"]:
@@ -715,12 +1273,17 @@ async def generate_with_replicate(source_image_b64: str, prompt: str) -> str:
 
             prediction_url = prediction["urls"]["get"]
 
-            # Poll until finished
-            for _ in range(60):  # ~5 minutes max
-                await asyncio.sleep(5)
+            # Poll until finished - start quickly and back off, since most jobs finish
+            # well inside a minute and a fixed 5s interval added up to 5s of dead wait
+            loop = asyncio.get_running_loop()
+            deadline = loop.time() + REPLICATE_POLL_TIMEOUT
+            delay = REPLICATE_POLL_INITIAL_DELAY
+            while loop.time() < deadline:
+                await asyncio.sleep(delay)
+                delay = min(delay * 1.5, REPLICATE_POLL_MAX_DELAY)
 
-                status_response = await client.get(prediction_url, headers=headers)
-                status = status_response.json()
+                status_response = await client.get(prediction_url, headers=headers, timeout=REPLICATE_TIMEOUT)
+                status = orjson.loads(status_response.content)
 
                 if status["status"] == "succeeded":
                     output_url = status.get("output")
@@ -730,12 +1293,16 @@ async def generate_with_replicate(source_image_b64: str, prompt: str) -> str:
                         raise HTTPException(status_code=500, detail="Replicate generation succeeded but returned no image")
 
                     # Fetch the generated image
-                    img_response = await client.get(output_url)
+                    async with client.stream("GET", output_url, timeout=REPLICATE_TIMEOUT) as img_response:
+                        if img_response.status_code != 200:
+                            raise HTTPException(status_code=500, detail="Failed to download generated image from Replicate")
 
-                    if img_response.status_code != 200 or not img_response.content:
+                        image_data = await read_image_body(img_response, too_large_detail="Generated image from Replicate is too large")
+
+                    if not image_data:
                         raise HTTPException(status_code=500, detail="Failed to download generated image from Replicate")
 
-                    return base64.b64encode(img_response.content).decode("utf-8")
+                    return pybase64.b64encode(image_data).decode("utf-8")
 
                 elif status["status"] == "failed":
                     error_msg = status.get('error', 'Unknown error')
@@ -758,9 +1325,8 @@ async def generate_with_replicate(source_image_b64: str, prompt: str) -> str:
             raise HTTPException(status_code=500, detail="Network error communicating with Replicate API")
         except Exception as e:
             print(f"[ERROR] Unexpected error in generate_with_replicate: {e}")
-            import traceback
             traceback.print_exc()
-            raise HTTPException(status_code=500, detail=f"Unexpected error during image generation: {str(e)}")
+            raise HTTPException(status_code=500, detail=f"Unexpected error during image generation: {e}")
 
 
 async def generate_with_gemini(source_image_b64: str, prompt: str) -> str:
@@ -809,9 +1375,10 @@ async def generate_with_gemini(source_image_b64: str, prompt: str) -> str:
         }
     }
 
-    async with httpx.AsyncClient(timeout=180.0) as client:
+    async with pooled_http_client() as client:
         try:
-            response = await client.post(api_url, json=payload, headers=headers)
+            # orjson rather than httpx's stdlib json= encoder - the payload carries the whole source image
+            response = await client.post(api_url, content=orjson.dumps(payload), headers=headers, timeout=GEMINI_TIMEOUT)
 
             print(f"[DEBUG] Gemini response status: {response.status_code}")
 
@@ -832,7 +1399,8 @@ async def generate_with_gemini(source_image_b64: str, prompt: str) -> str:
                         detail=f"Gemini API error (HTTP {response.status_code}): {error_detail[:200]}"
                     )
 
-            result = response.json()
+            # The response carries the generated image as base64 - parse the raw bytes with orjson
+            result = orjson.loads(response.content)
 
             candidates = result.get('candidates', [])
             if not candidates:
@@ -858,9 +1426,8 @@ async def generate_with_gemini(source_image_b64: str, prompt: str) -> str:
             raise HTTPException(status_code=500, detail="Network error communicating with Gemini API")
         except Exception as e:
             print(f"[ERROR] Unexpected error in generate_with_gemini: {e}")
-            import traceback
             traceback.print_exc()
-            raise HTTPException(status_code=500, detail=f"Unexpected error during image generation: {str(e)}")
+            raise HTTPException(status_code=500, detail=f"Unexpected error during image generation: {e}")
 
 
 async def generate_renovation_image(request: RenovationRequest) -> str:
@@ -911,18 +1478,27 @@ async def health_check():
     }
 
 
+# /models response cache - the model list rarely changes, so skip the Google round trip on repeat calls
+_models_cache: Optional[tuple[float, dict]] = None
+
 @app.get("/models")
 async def list_available_models():
     """
     List available Gemini models. Useful for debugging which models
     support image generation on your API key.
     """
+    global _models_cache
+
     if not GEMINI_API_KEY:
         raise HTTPException(status_code=500, detail="No API key configured")
-    
-    async with httpx.AsyncClient() as client:
+
+    if _models_cache is not None and time.monotonic() - _models_cache[0] < MODELS_CACHE_TTL:
+        return _models_cache[1]
+
+    async with pooled_http_client() as client:
         response = await client.get(
-            f"https://generativelanguage.googleapis.com/v1beta/models?key={GEMINI_API_KEY}"
+            f"https://generativelanguage.googleapis.com/v1beta/models?key={GEMINI_API_KEY}",
+            timeout=5.0
         )
         
         if response.status_code != 200:
@@ -931,19 +1507,18 @@ async def list_available_models():
         models = response.json().get('models', [])
         
         # Filter to models that support generateContent (needed for image gen)
-        relevant_models = []
-        for model in models:
-            name = model.get('name', '').replace('models/', '')
-            methods = model.get('supportedGenerationMethods', [])
-            if 'generateContent' in methods:
-                relevant_models.append({
-                    "name": name,
-                    "display_name": model.get('displayName', ''),
-                    "description": model.get('description', ''),
-                    "methods": methods
-                })
-        
-        return {
+        relevant_models = [
+            {
+                "name": model.get('name', '').removeprefix('models/'),
+                "display_name": model.get('displayName', ''),
+                "description": model.get('description', ''),
+                "methods": methods
+            }
+            for model in models
+            if 'generateContent' in (methods := model.get('supportedGenerationMethods', []))
+        ]
+
+        result = {
             "models": relevant_models,
             "recommended_for_images": [
                 "gemini-3-pro-image-preview",
@@ -951,6 +1526,8 @@ async def list_available_models():
                 "gemini-2.5-flash-preview-04-17"
             ]
         }
+        _models_cache = (time.monotonic(), result)
+        return result
 
 
 @app.post("/property", response_model=PropertyResponse)
@@ -966,6 +1543,55 @@ async def get_property_images(
     return await get_property_from_rightmove(str(request.url))
 
 
+def validate_batch_urls(request: BatchPropertyRequest) -> list[str]:
+    """Check a batch request's URL count and return the URLs as strings."""
+    if not request.urls:
+        raise HTTPException(status_code=400, detail="urls cannot be empty")
+
+    if len(request.urls) > MAX_BATCH_URLS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Too many URLs: maximum {MAX_BATCH_URLS} per batch"
+        )
+
+    return [str(url) for url in request.urls]
+
+
+@app.post("/property/batch", response_model=BatchPropertyResponse)
+async def get_property_images_batch(
+    request: BatchPropertyRequest
+):
+    """
+    Extract property images from several Rightmove listing URLs at once.
+    Each URL succeeds or fails independently - failures carry an error message.
+    NO AUTHENTICATION REQUIRED - same as /property.
+    """
+    urls = validate_batch_urls(request)
+    print(f"[INFO] Batch property fetch (unauthenticated): {len(urls)} URLs")
+
+    return BatchPropertyResponse(results=await get_properties_batch(urls))
+
+
+@app.post("/property/stream")
+async def stream_property_images(
+    request: BatchPropertyRequest
+):
+    """
+    Streaming variant of /property/batch.
+    Returns newline-delimited JSON, one result per line in completion order,
+    so the frontend can render listings as they arrive.
+    NO AUTHENTICATION REQUIRED - same as /property.
+    """
+    urls = validate_batch_urls(request)
+    print(f"[INFO] Streaming property fetch (unauthenticated): {len(urls)} URLs")
+
+    async def ndjson_lines():
+        async for result in stream_properties(urls):
+            yield result.model_dump_json() + "\n"
+
+    return StreamingResponse(ndjson_lines(), media_type="application/x-ndjson")
+
+
 @app.get("/proxy-image")
 async def proxy_image(
     url: str
@@ -976,29 +1602,24 @@ async def proxy_image(
     """
     print(f"[INFO] Image proxy (unauthenticated)")
 
-    headers = {
-        "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-        "Accept": "image/avif,image/webp,image/apng,image/svg+xml,image/*,*/*;q=0.8",
-        "Accept-Language": "en-GB,en;q=0.9",
-        "Referer": "https://www.rightmove.co.uk/",
-    }
-    
-    async with httpx.AsyncClient(timeout=30.0) as client:
-        response = await client.get(url, headers=headers, follow_redirects=True)
-        
-        if response.status_code != 200:
-            raise HTTPException(status_code=response.status_code, detail="Failed to fetch image")
-        
-        # Determine content type from URL
-        if "png" in url.lower():
+    # Stream with a size cap - this endpoint is unauthenticated and takes any URL
+    async with pooled_http_client() as client:
+        async with client.stream("GET", url, headers=IMAGE_REQUEST_HEADERS, follow_redirects=True) as response:
+            if response.status_code != 200:
+                raise HTTPException(status_code=response.status_code, detail="Failed to fetch image")
+
+            image_data = await read_image_body(response)
+
+        # Determine content type from the file signature - CDN URLs often have no extension
+        if image_data.startswith(b"\x89PNG\r\n\x1a\n"):
             mime_type = "image/png"
-        elif "webp" in url.lower():
+        elif image_data[:4] == b"RIFF" and image_data[8:12] == b"WEBP":
             mime_type = "image/webp"
         else:
             mime_type = "image/jpeg"
         
         # Return as base64 data URL
-        b64_data = base64.b64encode(response.content).decode('utf-8')
+        b64_data = pybase64.b64encode(image_data).decode('utf-8')
         data_url = f"data:{mime_type};base64,{b64_data}"
         
         return {"data_url": data_url}
@@ -1022,7 +1643,7 @@ async def generate_renovation(
 
     try:
         # 1. Validate input parameters
-        if not request.image_url or not request.image_url.strip():
+        if not request.image_url or request.image_url.isspace():
             raise HTTPException(
                 status_code=400,
                 detail="image_url is required and cannot be empty"
@@ -1085,13 +1706,12 @@ async def generate_renovation(
 
     except Exception as e:
         # Catch any unexpected errors and return helpful message
-        print(f"[ERROR] Unexpected error in /renovate endpoint: {type(e).__name__}: {str(e)}")
-        import traceback
+        print(f"[ERROR] Unexpected error in /renovate endpoint: {type(e).__name__}: {e}")
         traceback.print_exc()
 
         raise HTTPException(
             status_code=500,
-            detail=f"Unexpected server error: {str(e)}. Please try again or contact support if the issue persists."
+            detail=f"Unexpected server error: {e}. Please try again or contact support if the issue persists."
         )
 
 
@@ -1117,4 +1737,5 @@ app.mount("/", StaticFiles(directory=".", html=True), name="static")
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    # uvloop ships with uvicorn[standard]
+    uvicorn.run(app, host="0.0.0.0", port=8000, loop="uvloop")
@@ -22,7 +22,7 @@ import json
 import asyncio
 from typing import Optional
 from dataclasses import dataclass, field
-from urllib.parse import urlparse
+from urllib.parse import urlparse, parse_qs
 
 try:
     from playwright.async_api import async_playwright, Page, Browser, TimeoutError as PlaywrightTimeout
@@ -142,6 +142,34 @@ def extract_property_id(url: str) -> str:
     return ""
 
 
+# Hosts whose listing URLs may be collapsed to the canonical form
+RIGHTMOVE_HOSTS = frozenset({'rightmove.co.uk', 'www.rightmove.co.uk'})
+
+
+def normalize_listing_url(url: str) -> Optional[str]:
+    """
+    Canonical form of a Rightmove listing URL, for de-duplicating requests.
+    Tracking params, fragments and URL variants all collapse to the property ID.
+    Returns None for anything that isn't a Rightmove listing URL.
+    """
+    parsed = urlparse(url)
+    if parsed.scheme not in ('http', 'https') or parsed.hostname not in RIGHTMOVE_HOSTS:
+        return None
+
+    # Path only - a query like ?next=/properties/123 must not pass for listing 123.
+    # The one query form Rightmove itself uses is an exact propertyId parameter.
+    property_id = extract_property_id(parsed.path)
+    if not property_id:
+        property_id = next(
+            (value for value in parse_qs(parsed.query).get('propertyId', []) if value.isdigit()),
+            "",
+        )
+    if not property_id:
+        return None
+
+    return f"https://www.rightmove.co.uk/properties/{property_id}"
+
+
 def upgrade_image_resolution(url: str) -> str:
     """
     Upgrade Rightmove image URL to highest resolution.
@@ -373,10 +401,35 @@ def extract_property_details(data: dict, page_content: str) -> dict:
     return details
 
 
-async def scrape_with_httpx_fallback(url: str, timeout: float = 30.0) -> PropertyListing:
+def parse_listing_html(html: str) -> tuple[Optional[dict], list[PropertyImage], dict]:
+    """
+    Parse PAGE_MODEL, images and property details from rendered HTML.
+
+    Pure CPU work (the brace-counting scan walks 500KB+ of HTML), so callers
+    run it via asyncio.to_thread to keep the event loop free for other scrapes.
+
+    Returns:
+        (page_model, images, details) - page_model is None if not found
+    """
+    page_model = parse_page_model(html)
+
+    if page_model:
+        images = extract_images_from_page_model(page_model)
+        details = extract_property_details(page_model, html)
+    else:
+        images = []
+        details = extract_property_details({}, html)
+
+    return page_model, images, details
+
+
+async def scrape_with_httpx_fallback(url: str, timeout: float = 30.0, client: Optional[httpx.AsyncClient] = None) -> PropertyListing:
     """
     Fallback scraper using httpx when Playwright is not available.
     Less reliable but works on resource-constrained environments.
+
+    Pass a long-lived client to reuse its pooled (already warm) connections;
+    otherwise a throwaway client is created for this request.
     """
     parsed = urlparse(url)
     if 'rightmove.co.uk' not in parsed.netloc:
@@ -394,44 +447,49 @@ async def scrape_with_httpx_fallback(url: str, timeout: float = 30.0) -> Propert
         "Accept-Language": "en-GB,en;q=0.9",
     }
 
-    async with httpx.AsyncClient(timeout=timeout, follow_redirects=True) as client:
-        response = await client.get(url, headers=headers)
-        response.raise_for_status()
-
-        html = response.text
-        print(f"[httpx] Fetched HTML ({len(html):,} chars)")
-
-        # Try to extract PAGE_MODEL
-        page_model = parse_page_model(html)
-
-        if page_model:
-            print(f"[httpx] PAGE_MODEL found!")
-            images = extract_images_from_page_model(page_model)
-            details = extract_property_details(page_model, html)
-        else:
-            print(f"[httpx] PAGE_MODEL not found, limited data available")
-            images = []
-            details = extract_property_details({}, html)
-
-        return PropertyListing(
-            url=url,
-            property_id=property_id,
-            address=details['address'],
-            price=details['price'],
-            price_qualifier=details['price_qualifier'],
-            property_type=details['property_type'],
-            bedrooms=details['bedrooms'],
-            bathrooms=details['bathrooms'],
-            images=images,
-            floorplan_urls=details['floorplan_urls'],
-            agent_name=details['agent_name'],
-            agent_phone=details['agent_phone'],
-            description=details['description'],
-            features=details['features']
-        )
+    if client is None:
+        async with httpx.AsyncClient(timeout=timeout, follow_redirects=True) as own_client:
+            response = await own_client.get(url, headers=headers)
+    else:
+        response = await client.get(url, headers=headers, timeout=timeout, follow_redirects=True)
+
+    response.raise_for_status()
+
+    html = response.text
+    print(f"[httpx] Fetched HTML ({len(html):,} chars)")
+
+    # Parse off the event loop - PAGE_MODEL extraction is CPU-bound
+    page_model, images, details = await asyncio.to_thread(parse_listing_html, html)
+
+    if page_model:
+        print(f"[httpx] PAGE_MODEL found!")
+    else:
+        print(f"[httpx] PAGE_MODEL not found, limited data available")
+
+    return PropertyListing(
+        url=url,
+        property_id=property_id,
+        address=details['address'],
+        price=details['price'],
+        price_qualifier=details['price_qualifier'],
+        property_type=details['property_type'],
+        bedrooms=details['bedrooms'],
+        bathrooms=details['bathrooms'],
+        images=images,
+        floorplan_urls=details['floorplan_urls'],
+        agent_name=details['agent_name'],
+        agent_phone=details['agent_phone'],
+        description=details['description'],
+        features=details['features']
+    )
 
 
-async def scrape_rightmove_listing(url: str, timeout: float = 60.0, headless: bool = True) -> PropertyListing:
+async def scrape_rightmove_listing(
+    url: str,
+    timeout: float = 60.0,
+    headless: bool = True,
+    client: Optional[httpx.AsyncClient] = None,
+) -> PropertyListing:
     """
     Scrape a Rightmove property listing.
 
@@ -441,6 +499,7 @@ async def scrape_rightmove_listing(url: str, timeout: float = 60.0, headless: bo
         url: Full Rightmove property URL
         timeout: Request timeout in seconds
         headless: Run browser in headless mode (default: True)
+        client: Optional shared httpx client for the httpx fallback
 
     Returns:
         PropertyListing with images and metadata
@@ -452,14 +511,14 @@ async def scrape_rightmove_listing(url: str, timeout: float = 60.0, headless: bo
     # Use httpx fallback if Playwright is not available
     if not PLAYWRIGHT_AVAILABLE:
         print("[INFO] Using httpx fallback (Playwright not available)")
-        return await scrape_with_httpx_fallback(url, timeout=30.0)
+        return await scrape_with_httpx_fallback(url, timeout=30.0, client=client)
 
     # Try Playwright, fallback to httpx on failure
     try:
         return await _scrape_with_playwright(url, timeout, headless)
     except Exception as e:
         print(f"[WARNING] Playwright failed ({str(e)}), trying httpx fallback...")
-        return await scrape_with_httpx_fallback(url, timeout=30.0)
+        return await scrape_with_httpx_fallback(url, timeout=30.0, client=client)
 
 
 async def _scrape_with_playwright(url: str, timeout: float = 60.0, headless: bool = True) -> PropertyListing:
@@ -539,12 +598,11 @@ async def _scrape_with_playwright(url: str, timeout: float = 60.0, headless: boo
             html = await page.content()
             print(f"[Playwright] Extracted HTML ({len(html):,} chars)")
 
-            # Try to extract PAGE_MODEL first (most reliable)
-            page_model = parse_page_model(html)
+            # Try to extract PAGE_MODEL first (most reliable), parsed off the event loop
+            page_model, images, details = await asyncio.to_thread(parse_listing_html, html)
 
             if page_model:
                 print(f"[Playwright] PAGE_MODEL found!")
-                images = extract_images_from_page_model(page_model)
                 print(f"[Playwright] Extracted {len(images)} images from PAGE_MODEL")
             else:
                 # Fallback: Extract images directly from DOM
@@ -606,9 +664,6 @@ async def _scrape_with_playwright(url: str, timeout: float = 60.0, headless: boo
 
                 print(f"[Playwright] Extracted {len(images)} unique images from DOM")
 
-            # Extract property details
-            details = extract_property_details(page_model or {}, html)
-
             return PropertyListing(
                 url=url,
                 property_id=property_id,